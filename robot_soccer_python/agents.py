@@ -12,6 +12,10 @@ from robot_soccer_python.utils import *
 # class Agent
 
 class Agent:
+    __slots__ = ("pose", "linear_speed", "angular_speed", "max_linear_speed",
+        "max_angular_speed", "radius", "bumper_state", "collision",
+        "collision_player_speed", "sleeping")
+
     def __init__(self, pose, max_linear_speed, max_angular_speed, radius):
         """
         Creates a roomba cleaning robot.
@@ -26,6 +30,8 @@ class Agent:
         :type radius: float
         :param bumper_state: its mean if robot colide with other robots or wall
         :type bumper_state: boolean
+        :param sleeping: if the agent is at rest and isn't updated by the simulation
+        :type sleeping: boolean
         """
         self.pose = pose
         self.linear_speed = 0.0
@@ -36,6 +42,7 @@ class Agent:
         self.bumper_state = False
         self.collision = None
         self.collision_player_speed = (0,0)
+        self.sleeping = False
     
     
     def set_velocity(self, linear_speed, angular_speed):
@@ -51,6 +58,8 @@ class Agent:
             self.max_linear_speed)
         self.angular_speed = clamp(angular_speed, -self.max_angular_speed, 
             self.max_angular_speed)
+        if self.linear_speed != 0 or self.angular_speed != 0:
+            self.sleeping = False
 
     def set_bumper_state_collision(self, bumper_state_collision):
         """
@@ -60,6 +69,15 @@ class Agent:
         :type bumper_state_collision: tuple
         """
         self.bumper_state, self.collision, self.collision_player_speed = bumper_state_collision
+        if self.bumper_state:
+            self.sleeping = False
+
+    def fall_asleep(self):
+        """
+        Marks the agent as sleeping if it is at rest and not in contact.
+        """
+        self.sleeping = (not self.bumper_state and self.linear_speed == 0 
+            and self.angular_speed == 0)
 
 
     def get_bumper_state(self):
@@ -117,6 +135,8 @@ class Player(Agent):
     """
     Represents a player robot.
     """
+    __slots__ = ("sensors",)
+
     def __init__(self, pose, max_linear_speed, max_angular_speed, radius):
         Agent.__init__(self, pose, max_linear_speed, max_angular_speed, radius)
         self.sensors = Sensors(self)
@@ -127,6 +147,8 @@ class Ball(Agent):
     """
     Represents a ball.
     """
+    __slots__ = ("behavior", "cont_friction")
+
     def __init__(self, pose, max_linear_speed, max_angular_speed, radius, behavior):
         Agent.__init__(self, pose, max_linear_speed, max_angular_speed, radius)
         self.behavior = behavior
@@ -191,15 +213,27 @@ class Sensors:
         rtype: list
         """
 
+        return (self.calculate_vectors(agent, self.flag_points) + 
+            self.calculate_vectors(agent, list_centers))
+
+    def calculate_vectors(self, agent, points):
+        """
+        Calculate the vector distance between agent and a list of points.
+
+        param agent: the agent that we are calculating the distances.
+        type agent: Player
+        param points: the list of points in pixels.
+        type points: list of tuple
+        return: list of distance to points
+        rtype: list
+        """
         self.agent_center = agent.pose
-        points = self.flag_points + list_centers
+        center_x = self.agent_center.position.x * M2PIX
+        center_y = self.agent_center.position.y * M2PIX
         dirvector_list = []
-        for point in points:
-            center = Vector2(self.agent_center.position.x * M2PIX,
-                self.agent_center.position.y * M2PIX)
-            dirvector = Vector2(*point).dirvector(center)
-            dirvector = self.is_visible(dirvector)
-            dirvector_list.append(dirvector)
+        for x, y in points:
+            dirvector = Vector2(x - center_x, y - center_y)
+            dirvector_list.append(self.is_visible(dirvector))
         
         return dirvector_list
 
@@ -213,9 +247,9 @@ class Sensors:
         rtype: Vector2
         """
         if not self.full_vision:
-            vector_agent = TransformCartesian(1, self.agent_center.rotation)
-            vector_agent = Vector2(vector_agent.x, vector_agent.y)
-            angle = acos(vector_agent.dot(vector)/vector.magnitude())
+            rotation = self.agent_center.rotation
+            dot = cos(rotation) * vector.x + sin(rotation) * vector.y
+            angle = acos(dot/vector.magnitude())
 
             if angle <= pi/4:
                 return vector
@@ -0,0 +1,100 @@
+# ______________________________________________________________________________
+# importation
+import numpy as np
+from robot_soccer_python.constants import *
+
+# ______________________________________________________________________________
+# heuristic policies
+#
+# The policies receive a batch state (see get_batch_state) and return the
+# commands (linear speed, angular speed) of all players of all simulations as
+# an array with shape (simulations, players, 2). If controlled is given, the
+# commands of the other players are zero. The left team (team 0) attacks to
+# the right and the right team (team 1) attacks to the left.
+
+GOAL_LINE = 30 * PIX2M  # distance from the wall to the goal line (m)
+GOAL_HALF_WIDTH = 100 * PIX2M  # half of the goal width (m)
+HEADING_GAIN = 4.0  # angular speed per radian of heading error
+ARRIVAL_DISTANCE = 0.5  # distance where players start to slow down (m)
+
+def attack_direction(state):
+    """
+    :return: +1 for players of the left team and -1 for the right team, (m, n).
+    :rtype: numpy.ndarray
+    """
+    return 1.0 - 2.0 * state["team"]
+
+def go_to(state, target, controlled=None):
+    """
+    Commands that drive each player to a target point.
+
+    :param state: the batch state.
+    :type state: dict
+    :param target: (m, n, 2) target of each player in meters.
+    :type target: numpy.ndarray
+    :param controlled: (n,) or (m, n) mask of the controlled players.
+    :type controlled: numpy.ndarray
+    :return: (m, n, 2) commands.
+    :rtype: numpy.ndarray
+    """
+    delta = target - state["player_position"]
+    distance = np.hypot(delta[..., 0], delta[..., 1])
+    error = np.arctan2(delta[..., 1], delta[..., 0]) - state["player_rotation"]
+    error = (error + pi) % (2 * pi) - pi
+    max_linear = state["player_max_linear_speed"]
+    max_angular = state["player_max_angular_speed"]
+    commands = np.empty(error.shape + (2,))
+    commands[..., 0] = (max_linear * np.clip(np.cos(error), 0.0, None)
+        * np.minimum(distance / ARRIVAL_DISTANCE, 1.0))
+    commands[..., 1] = np.clip(HEADING_GAIN * error, -max_angular, max_angular)
+    if controlled is not None:
+        commands *= np.broadcast_to(controlled, error.shape)[..., None]
+    return commands
+
+def ball_chaser(state, controlled=None):
+    """
+    Runs to the ball and pushes it towards the opponent goal: players go
+    behind the ball first and then through it.
+    """
+    ball = state["ball_position"][:, None, :]
+    direction = attack_direction(state)
+    behind = ball.copy().repeat(direction.shape[1], axis=1)
+    behind[..., 0] -= direction * (state["player_radius"] + state["ball_radius"][:, None])
+    # players already behind the ball go straight through it
+    aligned = (ball[..., 0] - state["player_position"][..., 0]) * direction > 0
+    target = np.where(aligned[..., None], ball, behind)
+    return go_to(state, target, controlled)
+
+def goalkeeper(state, controlled=None):
+    """
+    Stays in front of its own goal, following the y position of the ball
+    inside the goal width.
+    """
+    direction = attack_direction(state)
+    target = np.empty(direction.shape + (2,))
+    own_goal = np.where(direction > 0, GOAL_LINE, FIELD_WIDTH - GOAL_LINE)
+    target[..., 0] = own_goal + direction * state["player_radius"]
+    target[..., 1] = np.clip(state["ball_position"][:, None, 1],
+        FIELD_HEIGHT / 2 - GOAL_HALF_WIDTH, FIELD_HEIGHT / 2 + GOAL_HALF_WIDTH)
+    return go_to(state, target, controlled)
+
+def zone_defender(state, zone=(0.15, 0.45, 0.0, 1.0), controlled=None):
+    """
+    Holds a zone of its own half of the field, going to the point of the zone
+    that is nearest to the ball.
+
+    :param zone: (x min, x max, y min, y max) as fractions of the field,
+        measured from the player's own goal, or an (n, 4) array with a zone
+        for each player.
+    :type zone: tuple or numpy.ndarray
+    """
+    zone = np.broadcast_to(np.asarray(zone, dtype=float), state["team"].shape[-1:] + (4,))
+    direction = attack_direction(state)
+    left_side = direction > 0
+    x_min = np.where(left_side, zone[:, 0], 1.0 - zone[:, 1]) * FIELD_WIDTH
+    x_max = np.where(left_side, zone[:, 1], 1.0 - zone[:, 0]) * FIELD_WIDTH
+    target = np.empty(direction.shape + (2,))
+    target[..., 0] = np.clip(state["ball_position"][:, None, 0], x_min, x_max)
+    target[..., 1] = np.clip(state["ball_position"][:, None, 1],
+        zone[:, 2] * FIELD_HEIGHT, zone[:, 3] * FIELD_HEIGHT)
+    return go_to(state, target, controlled)
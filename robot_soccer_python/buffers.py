@@ -0,0 +1,91 @@
+# ______________________________________________________________________________
+# importation
+import numpy as np
+
+# ______________________________________________________________________________
+# class StateBuffer
+class StateBuffer:
+    """
+    Arrays of a state (see Simulation.get_state) allocated once. The arrays
+    are written only by the simulation, readers get read-only views.
+    """
+    def __init__(self, simulation):
+        """
+        :param simulation: the simulation whose state is kept.
+        :type simulation: Simulation
+        """
+        self.arrays = simulation.new_state()
+        self.views = {}
+        for name, array in self.arrays.items():
+            view = array.view()
+            view.flags.writeable = False
+            self.views[name] = view
+        self.version = -1  # -1 while it is being written
+
+    def write(self, simulation):
+        self.version = -1
+        simulation.write_state(self.arrays)
+        self.version = simulation.tick
+
+# ______________________________________________________________________________
+# class DoubleBufferedState
+class DoubleBufferedState:
+    """
+    The state of the last completed frame, for readers in other threads.
+    The simulation writes the back buffer and then makes it the front buffer
+    with a single assignment, so it never waits for the readers, and the
+    readers never take a lock: a copy is retried if the buffer was written
+    again while it was copied.
+    """
+    def __init__(self, simulation):
+        """
+        Creates the buffers and publishes the current state.
+
+        :param simulation: the simulation.
+        :type simulation: Simulation
+        """
+        self.buffers = (StateBuffer(simulation), StateBuffer(simulation))
+        self.front = self.buffers[1]
+        self.publish(simulation)
+
+    def publish(self, simulation):
+        """
+        Writes the current state in the back buffer and flips the buffers.
+        It is called by Simulation.update.
+
+        :param simulation: the simulation.
+        :type simulation: Simulation
+        """
+        back = self.buffers[0] if self.front is self.buffers[1] else self.buffers[1]
+        back.write(simulation)
+        self.front = back
+
+    def version(self):
+        """
+        :return: the tick of the newest published state.
+        :rtype: int
+        """
+        return self.front.version
+
+    def read(self, copy=True):
+        """
+        Gets the newest published state.
+
+        :param copy: if True, the arrays are copied and the copy is always
+            consistent. If False, read-only views of the front buffer are
+            returned without copying: they are valid only until the buffer
+            is written again, two frames later.
+        :type copy: bool
+        :return: arrays by name, like Simulation.get_state.
+        :rtype: dict
+        """
+        while True:
+            buffer = self.front
+            version = buffer.version
+            if version < 0:
+                continue
+            if not copy:
+                return buffer.views
+            state = {name: array.copy() for name, array in buffer.views.items()}
+            if buffer.version == version:
+                return state
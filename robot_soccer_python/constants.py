@@ -5,11 +5,17 @@ SCREEN_WIDTH = 1000
 SCREEN_HEIGHT = 650 
 PIX2M = 0.01  # factor to convert from pixels to meters
 M2PIX = 100.0  # factor to convert from meters to pixels
+FIELD_WIDTH = SCREEN_WIDTH * PIX2M  # screen limits in meters
+FIELD_HEIGHT = SCREEN_HEIGHT * PIX2M
 
 # Sample Time Parameters
 FREQUENCY = 60.0  # simulation frequency
 SAMPLE_TIME = 1.0 / FREQUENCY  # simulation sample time
 
+# Game Parameters
+GOAL_INTERVAL = 3.0  # minimum time between two goals (s)
+RESTART_TIME = 1.0  # time that players and ball are held in the initial position after a goal (s)
+
 # world Parameters
 GRAVITY_ACCLERATION = 9.8
 
@@ -19,13 +25,17 @@ REFLECTION = pi
 BALL_MASS = 0.450
 RADIUS_BALL = 0.05
 FACTOR_FRICTION = GRAVITY_ACCLERATION*FRICTION_SLOWDOWN*SAMPLE_TIME/100
+INTERCEPT_HORIZON = 5.0  # time of the ball's path predicted for intercepts (s)
 
 # players Parameters
 PLAYER_MASS = 75
-BACK_SPEED_COLISION = -0.1
+BACK_SPEED_COLISION = -0.1  # deprecated: not used since the contact solver
+CONTACT_ITERATIONS = 8  # iterations of the contact solver per frame
+CONTACT_TOLERANCE = 1.0e-6  # players that the solver left touching are still in contact (m)
 
 # Vision Parameters
 RADIAN_TO_DEGREE = 180 / pi
+SENSOR_CHANNELS = ("flags", "teammates", "opponents", "ball")
 
 # colors
 RED_COLOR = (255,0,0)
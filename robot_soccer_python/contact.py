@@ -0,0 +1,127 @@
+# ______________________________________________________________________________
+# importation
+import numpy as np
+from robot_soccer_python.constants import *
+
+# ______________________________________________________________________________
+# class ContactSolver
+class ContactSolver:
+    """
+    Position based solver for the contacts between players. All overlapping
+    pairs are separated together, in a fixed number of vectorized iterations,
+    so the work per frame doesn't depend on how crowded the field is.
+
+    The work arrays (n x n, one cell per pair of players) are allocated once
+    in prepare, and every operation writes in them, so solving doesn't
+    allocate memory.
+    """
+    def __init__(self, iterations=CONTACT_ITERATIONS):
+        """
+        Creates the solver.
+
+        :param iterations: number of iterations per frame.
+        :type iterations: int
+        """
+        self.iterations = iterations
+        self.positions = None
+        self.radius = None
+
+    def prepare(self, positions, radius):
+        """
+        Allocates the work arrays for the positions and radius arrays. It is
+        done again only when solve is called with other arrays.
+
+        :param positions: (n, 2) array with the players' positions.
+        :type positions: numpy.ndarray
+        :param radius: (n,) array with the players' radius.
+        :type radius: numpy.ndarray
+        """
+        if positions is self.positions and radius is self.radius:
+            return
+        n = len(positions)
+        self.positions, self.radius = positions, radius
+        self.x, self.y = positions[:, 0], positions[:, 1]
+        self.x_row, self.x_column = self.x[None, :], self.x[:, None]
+        self.y_row, self.y_column = self.y[None, :], self.y[:, None]
+        self.max_x = FIELD_WIDTH - radius
+        self.max_y = FIELD_HEIGHT - radius
+        # a player is never in contact with itself
+        self.min_dist = radius[:, None] + radius[None, :]
+        np.fill_diagonal(self.min_dist, -1.0)
+        self.touch_dist = self.min_dist + CONTACT_TOLERANCE
+        # players in the same place are separated along the x axis
+        self.tie = np.sign(np.arange(n)[None, :] - np.arange(n)[:, None]).astype(float)
+        self.row, self.column = np.empty((n, n)), np.empty((n, n))
+        self.dx, self.dy = np.empty((n, n)), np.empty((n, n))
+        self.dist, self.overlap, self.work = np.empty((n, n)), np.empty((n, n)), np.empty((n, n))
+        self.contact = np.empty((n, n), dtype=bool)
+        self.same = np.empty((n, n), dtype=bool)
+        self.in_contact = np.empty((n, n), dtype=bool)
+        self.push, self.ones = np.empty(n), np.ones(n)
+        self.zero, self.one, self.half = np.array(0.0), np.array(1.0), np.array(0.5)
+
+    def distances(self):
+        # delta from each player (row) to each other player (column); the
+        # coordinates are copied to (n, n) arrays first because numpy
+        # allocates a temporary array for the broadcast operands of a ufunc
+        np.copyto(self.row, self.x_row)
+        np.copyto(self.column, self.x_column)
+        np.subtract(self.row, self.column, out=self.dx)
+        np.copyto(self.row, self.y_row)
+        np.copyto(self.column, self.y_column)
+        np.subtract(self.row, self.column, out=self.dy)
+        np.hypot(self.dx, self.dy, out=self.dist)
+
+    def solve(self, positions, radius):
+        """
+        Moves the players so that they don't overlap and stay in the field.
+
+        :param positions: (n, 2) array with the players' positions in meters,
+            changed in place.
+        :type positions: numpy.ndarray
+        :param radius: (n,) array with the players' radius.
+        :type radius: numpy.ndarray
+        :return: (n, n) mask of the pairs that were in contact: overlapping
+            during the solve or touching after it (closer than
+            CONTACT_TOLERANCE). It is overwritten by the next solve.
+        :rtype: numpy.ndarray
+        """
+        self.prepare(positions, radius)
+        dx, dy, dist, overlap, work = self.dx, self.dy, self.dist, self.overlap, self.work
+        contact, same, in_contact = self.contact, self.same, self.in_contact
+        in_contact.fill(False)
+        for _ in range(self.iterations):
+            self.distances()
+            np.subtract(self.min_dist, dist, out=overlap)
+            np.greater(overlap, self.zero, out=contact)
+            if not np.count_nonzero(contact):
+                break
+            np.logical_or(in_contact, contact, out=in_contact)
+            # the pairs in the same place (and each player with itself) get
+            # a distance of 1, so the division below is always defined
+            np.less(dist, 1.0e-9, out=same)
+            np.copyto(dx, self.tie, where=same)
+            np.copyto(dy, self.zero, where=same)
+            np.copyto(dist, self.one, where=same)
+            # Jacobi step: every pair is corrected from the same positions,
+            # each player moves half of the overlap away from the other
+            np.maximum(overlap, self.zero, out=overlap)
+            np.divide(overlap, dist, out=work)
+            np.multiply(work, self.half, out=work)
+            # the sums over the rows are products with a vector of ones
+            np.multiply(work, dx, out=overlap)
+            np.dot(overlap, self.ones, out=self.push)
+            np.subtract(self.x, self.push, out=self.x)
+            np.multiply(work, dy, out=overlap)
+            np.dot(overlap, self.ones, out=self.push)
+            np.subtract(self.y, self.push, out=self.y)
+            np.maximum(self.x, radius, out=self.x)
+            np.minimum(self.x, self.max_x, out=self.x)
+            np.maximum(self.y, radius, out=self.y)
+            np.minimum(self.y, self.max_y, out=self.y)
+
+        # the players that the solver left touching are still in contact
+        self.distances()
+        np.less_equal(dist, self.touch_dist, out=contact)
+        np.logical_or(in_contact, contact, out=in_contact)
+        return in_contact
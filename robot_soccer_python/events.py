@@ -0,0 +1,172 @@
+# ______________________________________________________________________________
+# importation
+from collections import deque
+
+# ______________________________________________________________________________
+# event kinds
+GOAL = "goal"
+RESTART = "restart"
+WALL_HIT = "wall_hit"
+PLAYER_BUMP = "player_bump"
+BALL_CONTACT = "ball_contact"
+
+# ______________________________________________________________________________
+# class Event
+class Event(object):
+    """
+    Base class of the events emitted by the simulation.
+    """
+    kind = None
+
+    def __init__(self, tick):
+        """
+        Creates an event.
+
+        :param tick: the simulation tick where the event happened.
+        :type tick: int
+        """
+        self.tick = tick
+
+    def __repr__(self):
+        fields = ", ".join("%s=%r" % item for item in vars(self).items())
+        return "%s(%s)" % (type(self).__name__, fields)
+
+
+class GoalEvent(Event):
+    """
+    A team has scored a goal.
+    """
+    kind = GOAL
+
+    def __init__(self, tick, team):
+        """
+        :param team: the team that scored, "left" or "right".
+        :type team: str
+        """
+        super().__init__(tick)
+        self.team = team
+
+
+class RestartEvent(Event):
+    """
+    Players and ball were put back in their initial positions.
+    """
+    kind = RESTART
+
+
+class WallHitEvent(Event):
+    """
+    A player or the ball has hit a wall.
+    """
+    kind = WALL_HIT
+
+    def __init__(self, tick, wall, player=None):
+        """
+        :param wall: the wall that was hit: "left", "right", "top" or "bottom".
+        :type wall: str
+        :param player: the index of the player, or None if it was the ball.
+        :type player: int or None
+        """
+        super().__init__(tick)
+        self.wall = wall
+        self.player = player
+
+
+class PlayerBumpEvent(Event):
+    """
+    Two players have bumped into each other.
+    """
+    kind = PLAYER_BUMP
+
+    def __init__(self, tick, player, other):
+        """
+        :param player: the index of the player that detected the bump.
+        :type player: int
+        :param other: the index of the player that was hit.
+        :type other: int
+        """
+        super().__init__(tick)
+        self.player = player
+        self.other = other
+
+
+class BallContactEvent(Event):
+    """
+    A player has touched the ball.
+    """
+    kind = BALL_CONTACT
+
+    def __init__(self, tick, player, impulse):
+        """
+        :param player: the index of the player that touched the ball.
+        :type player: int
+        :param impulse: the magnitude of the impulse given to the ball (kg.m/s).
+        :type impulse: float
+        """
+        super().__init__(tick)
+        self.player = player
+        self.impulse = impulse
+
+# ______________________________________________________________________________
+# class EventBuffer
+class EventBuffer(object):
+    """
+    Ring buffer of simulation events. When the buffer is full the oldest
+    events are discarded.
+    """
+    def __init__(self, capacity=1024):
+        """
+        Creates an event buffer.
+
+        :param capacity: maximum number of events kept in the buffer.
+        :type capacity: int
+        """
+        self.events = deque(maxlen=capacity)
+        self.callbacks = []
+        self.dropped = 0
+
+    def __len__(self):
+        return len(self.events)
+
+    def emit(self, event):
+        """
+        Stores an event and calls the subscribed callbacks.
+
+        :param event: the event.
+        :type event: Event
+        """
+        if len(self.events) == self.events.maxlen:
+            self.dropped += 1
+        self.events.append(event)
+        for callback in self.callbacks:
+            callback(event)
+
+    def subscribe(self, callback):
+        """
+        Registers a function called with every new event.
+
+        :param callback: function that receives an Event.
+        :type callback: callable
+        """
+        self.callbacks.append(callback)
+
+    def unsubscribe(self, callback):
+        self.callbacks.remove(callback)
+
+    def drain(self, kind=None):
+        """
+        Removes the stored events from the buffer and yields them in order.
+
+        :param kind: if given, only events of this kind are yielded (the
+            others are discarded too).
+        :type kind: str
+        :return: a generator of events.
+        :rtype: generator
+        """
+        while self.events:
+            event = self.events.popleft()
+            if kind is None or event.kind == kind:
+                yield event
+
+    def clear(self):
+        self.events.clear()
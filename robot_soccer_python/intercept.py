@@ -0,0 +1,102 @@
+# ______________________________________________________________________________
+# importation
+import numpy as np
+from robot_soccer_python.constants import *
+
+# ______________________________________________________________________________
+# ball path prediction
+
+def fold(x, low, high):
+    """
+    Reflects coordinates into [low, high], like a ball bouncing on walls.
+    """
+    length = high - low
+    u = np.mod(x - low, 2 * length)
+    return low + np.where(u <= length, u, 2 * length - u)
+
+def predict_ball_path(position, rotation, linear_speed, cont_friction, radius,
+        max_linear_speed, ticks):
+    """
+    Predicts the future positions of balls that nobody touches, with the same
+    friction model of MoveForwardStateBall: every frame the speed decreases by
+    FACTOR_FRICTION * cont_friction**(1/3) and cont_friction increases by one.
+    Bounces on the walls are mirrored, goals and restarts are not predicted.
+
+    :param position: (m, 2) positions of the balls.
+    :param rotation: (m,) rotations of the balls.
+    :param linear_speed: (m,) speeds of the balls.
+    :param cont_friction: (m,) friction counters of the balls.
+    :param radius: (m,) radius of the balls.
+    :param max_linear_speed: (m,) maximum speed of the balls.
+    :param ticks: number of frames predicted.
+    :type ticks: int
+    :return: (m, ticks, 2) positions after each of the next frames.
+    :rtype: numpy.ndarray
+    """
+    k = np.arange(1, ticks + 1)
+    counter = cont_friction[:, None] + k
+    speed = np.minimum(np.fabs(linear_speed), max_linear_speed)[:, None]
+    speed = speed - FACTOR_FRICTION * np.cumsum(np.cbrt(counter), axis=1)
+    speed = np.clip(speed, 0.0, max_linear_speed[:, None])
+    distance = np.cumsum(speed, axis=1) * SAMPLE_TIME
+    path = np.empty(distance.shape + (2,))
+    path[..., 0] = position[:, None, 0] + distance * np.cos(rotation)[:, None]
+    path[..., 1] = position[:, None, 1] + distance * np.sin(rotation)[:, None]
+    path[..., 0] = fold(path[..., 0], radius[:, None], FIELD_WIDTH - radius[:, None])
+    path[..., 1] = fold(path[..., 1], radius[:, None], FIELD_HEIGHT - radius[:, None])
+    return path
+
+# ______________________________________________________________________________
+# class BallPath
+class BallPath:
+    """
+    Predicted path of the balls of a batch state, computed once and shared by
+    the intercept queries of all players.
+    """
+    def __init__(self, state, horizon=INTERCEPT_HORIZON, max_linear_speed=1.0):
+        """
+        :param state: a batch state (see get_batch_state).
+        :type state: dict
+        :param horizon: predicted time (s).
+        :type horizon: float
+        :param max_linear_speed: maximum speed of the balls.
+        :type max_linear_speed: float
+        """
+        ticks = max(1, int(round(horizon * FREQUENCY)))
+        m = len(state["ball_position"])
+        self.times = np.arange(1, ticks + 1) * SAMPLE_TIME
+        self.path = predict_ball_path(state["ball_position"], state["ball_rotation"],
+            state["ball_linear_speed"], state["ball_cont_friction"], state["ball_radius"],
+            np.full(m, max_linear_speed), ticks)
+        self.ball_radius = state["ball_radius"]
+
+    def intercept(self, state):
+        """
+        Finds, for every player, the earliest point of the ball's path that the
+        player can reach in time, turning at its maximum angular speed and then
+        running at its maximum linear speed until it touches the ball. If the
+        ball can't be reached before the horizon, the last predicted point is
+        used.
+
+        :param state: the batch state used to create the path.
+        :type state: dict
+        :return: (m, n) times (s), (m, n, 2) points and (m, n) mask of the
+            players that reach the ball before the horizon.
+        :rtype: tuple of numpy.ndarray
+        """
+        position = state["player_position"][:, :, None, :]
+        delta = self.path[:, None, :, :] - position
+        distance = np.hypot(delta[..., 0], delta[..., 1])
+        heading = np.arctan2(delta[..., 1], delta[..., 0]) - state["player_rotation"][..., None]
+        heading = np.fabs((heading + pi) % (2 * pi) - pi)
+        reach = (state["player_radius"] + self.ball_radius[:, None])[..., None]
+        time = (heading / state["player_max_angular_speed"][..., None] +
+            np.maximum(distance - reach, 0.0) / state["player_max_linear_speed"][..., None])
+        in_time = time <= self.times
+        reachable = in_time.any(axis=-1)
+        first = np.where(reachable, in_time.argmax(axis=-1), len(self.times) - 1)
+        index = first[..., None]
+        times = np.where(reachable, self.times[first],
+            np.maximum(np.take_along_axis(time, index, -1)[..., 0], self.times[-1]))
+        points = np.take_along_axis(self.path[:, None, :, :], index[..., None], 2)[:, :, 0, :]
+        return times, points, reachable
@@ -0,0 +1,58 @@
+# ______________________________________________________________________________
+# importation
+import numpy as np
+
+# ______________________________________________________________________________
+# memory-mapped record files
+#
+# The file starts with a header of HEADER_SIZE bytes (uint64 fields, the
+# first one is a magic number that identifies the kind of file) followed by
+# the records. The other header fields are chosen by each kind of file.
+
+HEADER_SIZE = 64
+MAGIC_FIELD = 0
+
+def create_mapped_file(path, magic, dtype, count):
+    """
+    Creates a file with a header and count records filled with zeros.
+
+    :param path: path of the file.
+    :type path: str
+    :param magic: number that identifies the kind of file.
+    :type magic: int
+    :param dtype: type of the records.
+    :type dtype: numpy.dtype
+    :param count: number of records.
+    :type count: int
+    :return: the header and the records, writable.
+    :rtype: tuple of numpy.memmap
+    """
+    with open(path, "wb") as f:
+        f.truncate(HEADER_SIZE + count * dtype.itemsize)
+    header = np.memmap(path, np.uint64, "r+", 0, (HEADER_SIZE // 8,))
+    header[MAGIC_FIELD] = magic
+    records = np.memmap(path, dtype, "r+", HEADER_SIZE, (count,))
+    return header, records
+
+def open_mapped_file(path, magic, description, layout):
+    """
+    Opens an existing file, read only.
+
+    :param path: path of the file.
+    :type path: str
+    :param magic: number that identifies the kind of file.
+    :type magic: int
+    :param description: name of the kind of file, for the error message.
+    :type description: str
+    :param layout: function called with the header that returns the type
+        and the number of the records.
+    :type layout: callable
+    :return: the header and the records.
+    :rtype: tuple of numpy.memmap
+    """
+    header = np.memmap(path, np.uint64, "r", 0, (HEADER_SIZE // 8,))
+    if header[MAGIC_FIELD] != magic:
+        raise ValueError("%s is not a %s file" % (path, description))
+    dtype, count = layout(header)
+    records = np.memmap(path, dtype, "r", HEADER_SIZE, (count,))
+    return header, records
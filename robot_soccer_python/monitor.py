@@ -0,0 +1,159 @@
+# ______________________________________________________________________________
+# importation
+import math
+import pygame
+from robot_soccer_python.constants import *
+from robot_soccer_python.agents import Environment
+
+# ______________________________________________________________________________
+# class TiledMonitor
+class TiledMonitor:
+    """
+    One window with a grid of small fields, to watch many matches at once.
+    Each tile is drawn with the Environment on a full size surface that is
+    scaled down. At most tiles_per_frame tiles are drawn per frame, so the
+    cost doesn't grow with the number of matches: with many matches each
+    tile is just updated less often.
+    """
+    def __init__(self, sources, columns=None, scale=0.25, tile_rate=2.0,
+            tiles_per_frame=2, fps=30.0, caption="Robot soccer 2D monitor"):
+        """
+        Creates the monitor, closed.
+
+        :param sources: where the state of each match is taken from: objects
+            with a latest() method that returns a Snapshot (like SnapshotSlot)
+            or Simulation objects.
+        :type sources: list
+        :param columns: number of columns of the grid, by default a square grid.
+        :type columns: int
+        :param scale: size of a tile relative to the full window.
+        :type scale: float
+        :param tile_rate: maximum number of times per second a tile is updated.
+        :type tile_rate: float
+        :param tiles_per_frame: maximum number of tiles drawn per frame.
+        :type tiles_per_frame: int
+        :param fps: frames per second of the monitor.
+        :type fps: float
+        :param caption: title of the window.
+        :type caption: str
+        """
+        self.sources = list(sources)
+        self.columns = columns or max(1, int(math.ceil(math.sqrt(len(self.sources)))))
+        self.rows = max(1, int(math.ceil(len(self.sources) / float(self.columns))))
+        self.tile_size = (max(1, int(SCREEN_WIDTH * scale)), max(1, int(SCREEN_HEIGHT * scale)))
+        self.tile_interval = 1000.0 / tile_rate
+        self.tiles_per_frame = tiles_per_frame
+        self.fps = fps
+        self.caption = caption
+        self.window = None
+        self.canvas = None
+        self.environment = None
+        self.clock = None
+        self.next_tile = 0
+        self.drawn_at = [None] * len(self.sources)
+        self.drawn = [None] * len(self.sources)
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def is_open(self):
+        return self.window is not None
+
+    def open(self):
+        if self.is_open():
+            return
+        pygame.init()
+        self.window = pygame.display.set_mode((self.columns * self.tile_size[0],
+            self.rows * self.tile_size[1]))
+        pygame.display.set_caption(self.caption)
+        self.canvas = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        self.environment = Environment(self.canvas)
+        self.clock = pygame.time.Clock()
+
+    def close(self):
+        if self.is_open():
+            self.window = None
+            self.canvas = None
+            self.environment = None
+            self.clock = None
+            pygame.quit()
+
+    def latest(self, index):
+        source = self.sources[index]
+        if hasattr(source, "latest"):
+            return source.latest()
+        return source.snapshot()
+
+    def tile_rect(self, index):
+        width, height = self.tile_size
+        return pygame.Rect((index % self.columns) * width, (index // self.columns) * height,
+            width, height)
+
+    def draw_tile(self, index, snapshot):
+        """
+        Draws a match in its tile.
+
+        :param index: index of the match in sources.
+        :type index: int
+        :param snapshot: the state of the match.
+        :type snapshot: Snapshot
+        :return: the area of the window that was drawn.
+        :rtype: pygame.Rect
+        """
+        params = snapshot._asdict()
+        params["window"] = self.canvas
+        self.environment.draw(params)
+        rect = self.tile_rect(index)
+        pygame.transform.smoothscale(self.canvas, rect.size, self.window.subsurface(rect))
+        return rect
+
+    def refresh(self):
+        """
+        Draws the tiles that are due, at most tiles_per_frame, in round-robin.
+
+        :return: False if the window was closed by the user.
+        :rtype: bool
+        """
+        self.open()
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                self.close()
+                return False
+
+        now = pygame.time.get_ticks()
+        updated = []
+        for _ in range(len(self.sources)):
+            if len(updated) >= self.tiles_per_frame:
+                break
+            index = self.next_tile
+            self.next_tile = (self.next_tile + 1) % len(self.sources)
+            if self.drawn_at[index] is not None and now - self.drawn_at[index] < self.tile_interval:
+                continue
+            snapshot = self.latest(index)
+            if snapshot is None or snapshot is self.drawn[index]:
+                continue
+            updated.append(self.draw_tile(index, snapshot))
+            self.drawn_at[index] = now
+            self.drawn[index] = snapshot
+        if updated:
+            pygame.display.update(updated)
+        return True
+
+    def run(self, stop=None):
+        """
+        Refreshes the monitor at its frame rate until the window is closed or
+        stop is set.
+
+        :param stop: event that ends the loop.
+        :type stop: threading.Event
+        """
+        self.open()
+        while stop is None or not stop.is_set():
+            self.clock.tick(self.fps)
+            if not self.refresh():
+                break
+        self.close()
@@ -0,0 +1,163 @@
+# ______________________________________________________________________________
+# importation
+import collections
+import os
+import sys
+import threading
+import time
+
+# ______________________________________________________________________________
+# class SamplingProfiler
+class SamplingProfiler:
+    """
+    Statistical profiler: a thread takes the stack of the profiled thread at
+    a fixed interval. Unlike cProfile, the functions are not slowed down on
+    each call, the cost is only the sampling.
+    """
+    def __init__(self, interval=0.001, thread_id=None):
+        """
+        Creates the profiler, stopped.
+
+        :param interval: time between two samples (s).
+        :type interval: float
+        :param thread_id: thread to profile, by default the thread that calls start.
+        :type thread_id: int
+        """
+        self.interval = interval
+        self.thread_id = thread_id
+        self.samples = collections.Counter()
+        self.stop_event = threading.Event()
+        self.sampler = None
+        self.switch_interval = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def start(self):
+        if self.thread_id is None:
+            self.thread_id = threading.get_ident()
+        # the sampler only runs when it gets the GIL, so it is asked more often
+        self.switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(min(self.switch_interval, self.interval))
+        self.stop_event.clear()
+        self.sampler = threading.Thread(target=self.run, daemon=True)
+        self.sampler.start()
+
+    def stop(self):
+        self.stop_event.set()
+        self.sampler.join()
+        sys.setswitchinterval(self.switch_interval)
+
+    def run(self):
+        while not self.stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.samples[self.stack(frame)] += 1
+
+    @staticmethod
+    def stack(frame):
+        """
+        :return: the names of the functions of a stack, from the outermost.
+        :rtype: tuple of str
+        """
+        names = []
+        while frame is not None:
+            code = frame.f_code
+            names.append("%s (%s:%d)" % (code.co_name,
+                os.path.basename(code.co_filename), code.co_firstlineno))
+            frame = frame.f_back
+        return tuple(reversed(names))
+
+    def total(self):
+        return sum(self.samples.values())
+
+    def collapsed(self):
+        """
+        :return: the samples in the collapsed stack format used by flame graph tools.
+        :rtype: str
+        """
+        return "".join("%s %d\n" % (";".join(stack), count)
+            for stack, count in self.samples.most_common())
+
+    def top(self, count=20):
+        """
+        Finds the functions with more samples.
+
+        :param count: number of functions.
+        :type count: int
+        :return: (function, self samples, total samples), sorted by self samples.
+        :rtype: list of tuple
+        """
+        own = collections.Counter()
+        cumulative = collections.Counter()
+        for stack, n in self.samples.items():
+            own[stack[-1]] += n
+            for name in set(stack):
+                cumulative[name] += n
+        return [(name, n, cumulative[name]) for name, n in own.most_common(count)]
+
+    def summary(self, count=20):
+        """
+        :return: a table of the functions with more samples.
+        :rtype: str
+        """
+        total = max(self.total(), 1)
+        lines = ["%d samples, interval %g s" % (self.total(), self.interval),
+            "%7s %7s  %s" % ("self%", "total%", "function")]
+        for name, own, cumulative in self.top(count):
+            lines.append("%6.1f%% %6.1f%%  %s" % (100.0 * own / total, 100.0 * cumulative / total, name))
+        return "\n".join(lines) + "\n"
+
+    def write(self, path):
+        """
+        Writes the collapsed stacks in path + ".collapsed" and the summary in
+        path + ".txt".
+
+        :param path: path of the files, without extension.
+        :type path: str
+        """
+        with open(path + ".collapsed", "w") as f:
+            f.write(self.collapsed())
+        with open(path + ".txt", "w") as f:
+            f.write(self.summary())
+
+# ______________________________________________________________________________
+# profiling a simulation run
+
+def profile_simulation(simulation, ticks, controller=None, viewer=None,
+        interval=0.001, output=None):
+    """
+    Runs the simulation with the sampling profiler enabled.
+
+    :param simulation: the simulation.
+    :type simulation: Simulation
+    :param ticks: number of frames.
+    :type ticks: int
+    :param controller: function called as controller(simulation) every frame,
+        returning the commands of all players.
+    :type controller: callable
+    :param viewer: if given, every frame is drawn in this Viewer (without
+        waiting for the frame rate).
+    :type viewer: Viewer
+    :param interval: time between two samples (s).
+    :type interval: float
+    :param output: path of the output files, without extension (see SamplingProfiler.write).
+    :type output: str
+    :return: the profiler with the samples.
+    :rtype: SamplingProfiler
+    """
+    profiler = SamplingProfiler(interval)
+    with profiler:
+        for _ in range(ticks):
+            if controller is not None:
+                simulation.set_commands(controller(simulation))
+            simulation.update()
+            if viewer is not None:
+                viewer.render(simulation)
+    if output is not None:
+        profiler.write(output)
+    return profiler
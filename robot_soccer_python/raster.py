@@ -0,0 +1,139 @@
+# ______________________________________________________________________________
+# importation
+import numpy as np
+from robot_soccer_python.constants import *
+from robot_soccer_python.simulation import get_batch_state
+
+# ______________________________________________________________________________
+# channels of the rasters
+WALLS = 0
+TEAMMATES = 1
+OPPONENTS = 2
+BALL = 3
+CHANNELS = 4
+
+# ______________________________________________________________________________
+# class EgocentricRasterizer
+class EgocentricRasterizer:
+    """
+    Draws a small top-down occupancy image around each player, rotated to the
+    player's rotation, directly from the state arrays (without pygame).
+
+    The player is in the center of the image looking to the right: the column
+    grows in the direction the player is looking and the row grows to the
+    player's left (rotation + pi/2). The channels are WALLS (outside the
+    field), TEAMMATES, OPPONENTS and BALL.
+    """
+    def __init__(self, size=64, extent=3.0, dtype=np.uint8):
+        """
+        Creates the rasterizer.
+
+        :param size: width and height of the images in pixels.
+        :type size: int
+        :param extent: distance in meters from the player to the border of the image.
+        :type extent: float
+        :param dtype: type of the images.
+        :type dtype: numpy.dtype
+        """
+        self.size = size
+        self.extent = extent
+        self.cell = 2.0 * extent / size
+        self.dtype = dtype
+        # position of the center of each pixel relative to the player
+        offsets = (np.arange(size) + 0.5) * self.cell - extent
+        self.forward = offsets[None, :]
+        self.left = offsets[:, None]
+
+    def render(self, simulations, out=None):
+        """
+        Draws the images of all players of all simulations.
+
+        :param simulations: simulations with the same number of players.
+        :type simulations: list of Simulation
+        :param out: array where the images are drawn, see render_state.
+        :type out: numpy.ndarray
+        :return: images with shape (simulations, players, CHANNELS, size, size).
+        :rtype: numpy.ndarray
+        """
+        return self.render_state(get_batch_state(simulations), out)
+
+    def render_state(self, state, out=None):
+        """
+        Draws the images of all players from a batch state.
+
+        :param state: the arrays returned by get_batch_state.
+        :type state: dict
+        :param out: array where the images are drawn, to not allocate a new
+            one every frame. Its old content is overwritten, so keep a copy of
+            the images that are used later (frame stacking, replay).
+        :type out: numpy.ndarray
+        :return: images with shape (simulations, players, CHANNELS, size, size),
+            a new array if out is None.
+        :rtype: numpy.ndarray
+        """
+        position = state["player_position"]
+        rotation = state["player_rotation"]
+        m, n = rotation.shape
+        shape = (m, n, CHANNELS, self.size, self.size)
+        if out is None:
+            out = np.zeros(shape, dtype=self.dtype)
+        elif out.shape != shape:
+            raise ValueError("out has shape %s instead of %s" % (out.shape, shape))
+        else:
+            out.fill(0)
+        cos_r, sin_r = np.cos(rotation), np.sin(rotation)
+
+        # walls: every pixel whose center is outside the field
+        c, s = cos_r[..., None, None], sin_r[..., None, None]
+        x = position[..., 0, None, None] + c * self.forward - s * self.left
+        y = position[..., 1, None, None] + s * self.forward + c * self.left
+        out[:, :, WALLS] = (x < 0) | (x > FIELD_WIDTH) | (y < 0) | (y > FIELD_HEIGHT)
+
+        # other players, relative to each player (m, n, n)
+        delta = position[:, None, :, :] - position[:, :, None, :]
+        team = state["team"]
+        same_team = team[:, :, None] == team[:, None, :]
+        others = ~np.eye(n, dtype=bool)[None]
+        radius = np.broadcast_to(state["player_radius"][:, None, :], (m, n, n))
+        self.stamp(out, delta, cos_r, sin_r, radius, np.where(same_team, TEAMMATES, OPPONENTS), others)
+
+        # ball
+        delta = (state["ball_position"][:, None, :] - position)[:, :, None, :]
+        radius = np.broadcast_to(state["ball_radius"][:, None, None], (m, n, 1))
+        self.stamp(out, delta, cos_r, sin_r, radius, np.full((m, n, 1), BALL),
+            np.ones((m, n, 1), dtype=bool))
+        return out
+
+    def stamp(self, out, delta, cos_r, sin_r, radius, channel, mask):
+        """
+        Draws discs in the images.
+
+        :param out: the images.
+        :param delta: (m, n, k, 2) positions of k discs relative to each player.
+        :param cos_r: (m, n) cosine of the players' rotation.
+        :param sin_r: (m, n) sine of the players' rotation.
+        :param radius: (m, n, k) radius of the discs.
+        :param channel: (m, n, k) channel of the discs.
+        :param mask: (m, n, k) which discs are drawn.
+        """
+        c, s = cos_r[..., None], sin_r[..., None]
+        forward = c * delta[..., 0] + s * delta[..., 1]
+        left = -s * delta[..., 0] + c * delta[..., 1]
+        # disc centers in pixels
+        col = (forward + self.extent) / self.cell - 0.5
+        row = (left + self.extent) / self.cell - 0.5
+        # small discs cover at least the nearest pixel
+        r = np.maximum(radius / self.cell, 0.75)
+        reach = int(np.ceil(r.max())) if r.size else 0
+        span = np.arange(-reach, reach + 1)
+        # stencil around the nearest pixel of each disc: (..., 2 reach + 1, 2 reach + 1)
+        rows = np.rint(row)[..., None, None] + span[:, None]
+        cols = np.rint(col)[..., None, None] + span[None, :]
+        rows, cols = np.broadcast_arrays(rows, cols)
+        inside = (((rows - row[..., None, None])**2 + (cols - col[..., None, None])**2)
+            <= (r**2)[..., None, None])
+        inside &= (rows >= 0) & (rows < self.size) & (cols >= 0) & (cols < self.size)
+        inside &= mask[..., None, None]
+        index = np.nonzero(inside)
+        i, j = index[0], index[1]
+        out[i, j, channel[index[:3]], rows[index].astype(int), cols[index].astype(int)] = 1
@@ -0,0 +1,160 @@
+# ______________________________________________________________________________
+# importation
+import multiprocessing
+import queue
+import sys
+import threading
+import pygame
+from robot_soccer_python.constants import *
+from robot_soccer_python.simulation import draw_snapshot
+from robot_soccer_python.simulation2D import Viewer
+
+# ______________________________________________________________________________
+# latest value slots
+
+class SnapshotSlot:
+    """
+    Keeps only the newest snapshot published, for a renderer in a thread.
+    Publishing never blocks: it is a single assignment.
+    """
+    def __init__(self):
+        self.value = None
+
+    def publish(self, snapshot):
+        self.value = snapshot
+
+    def latest(self):
+        """
+        :return: the newest snapshot, or None if nothing was published.
+        :rtype: Snapshot
+        """
+        return self.value
+
+
+class ProcessSnapshotSlot:
+    """
+    Keeps only the newest snapshot published, for a renderer in another
+    process. Publishing never blocks: if the renderer hasn't taken the last
+    snapshot yet, it is replaced.
+    """
+    def __init__(self):
+        self.queue = multiprocessing.Queue(maxsize=1)
+        self.value = None
+
+    def publish(self, snapshot):
+        try:
+            self.queue.put_nowait(snapshot)
+        except queue.Full:
+            try:
+                self.queue.get_nowait()
+            except queue.Empty:
+                pass
+            try:
+                self.queue.put_nowait(snapshot)
+            except queue.Full:
+                pass
+
+    def latest(self):
+        try:
+            while True:
+                self.value = self.queue.get_nowait()
+        except queue.Empty:
+            pass
+        return self.value
+
+
+def render_loop(slot, stop, fps):
+    """
+    Draws the newest snapshot of the slot until stop is set or the window is
+    closed. Snapshots published between two frames are dropped.
+
+    :param slot: where the snapshots are published.
+    :type slot: SnapshotSlot or ProcessSnapshotSlot
+    :param stop: event that ends the loop.
+    :type stop: threading.Event or multiprocessing.Event
+    :param fps: maximum frames per second.
+    :type fps: float
+    """
+    viewer = Viewer()
+    viewer.open()
+    drawn = None
+    try:
+        while not stop.is_set():
+            viewer.clock.tick(fps)
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    stop.set()
+            snapshot = slot.latest()
+            if snapshot is not None and snapshot is not drawn:
+                draw_snapshot(snapshot, viewer.window, viewer.environment)
+                drawn = snapshot
+    finally:
+        viewer.close()
+
+# ______________________________________________________________________________
+# class Renderer
+class Renderer:
+    """
+    Draws the simulation in a thread or process separated from the physics.
+    The physics publishes snapshots and never waits for the drawing, and the
+    renderer draws whatever is newest, dropping frames if it is slow.
+
+    The pygame window is opened and closed (pygame.quit) by the renderer, so
+    the program shouldn't use pygame itself while a renderer runs in a
+    thread. On macOS the window can only be used from the main thread of a
+    process, so the renderer runs in another process there.
+    """
+    def __init__(self, fps=FREQUENCY, process=None):
+        """
+        Creates the renderer, stopped.
+
+        :param fps: maximum frames per second of the drawing.
+        :type fps: float
+        :param process: draw in another process instead of a thread, by
+            default only on macOS. The new process imports the main module
+            again on macOS and Windows, so the renderer must be started
+            under if __name__ == "__main__".
+        :type process: bool
+        """
+        if process is None:
+            process = sys.platform == "darwin"
+        if process:
+            self.slot = ProcessSnapshotSlot()
+            self.stop_event = multiprocessing.Event()
+            worker = multiprocessing.Process
+        else:
+            self.slot = SnapshotSlot()
+            self.stop_event = threading.Event()
+            worker = threading.Thread
+        self.worker = worker(target=render_loop, args=(self.slot, self.stop_event, fps),
+            daemon=True)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def start(self):
+        self.worker.start()
+
+    def is_alive(self):
+        """
+        :return: False when the renderer was stopped or its window was closed.
+        :rtype: bool
+        """
+        return self.worker.is_alive() and not self.stop_event.is_set()
+
+    def publish(self, simulation):
+        """
+        Publishes the current state of the simulation for drawing.
+
+        :param simulation: the simulation.
+        :type simulation: Simulation
+        """
+        self.slot.publish(simulation.snapshot())
+
+    def stop(self, timeout=5.0):
+        self.stop_event.set()
+        self.worker.join(timeout)
@@ -0,0 +1,215 @@
+# ______________________________________________________________________________
+# importation
+import numpy as np
+from robot_soccer_python.constants import *
+from robot_soccer_python.baselines import attack_direction
+
+# ______________________________________________________________________________
+# reward terms
+#
+# A term is called as term(previous, state) with the batch states (see
+# get_batch_state) before and after a frame, and returns the reward of every
+# player of every simulation as an array with shape (simulations, players).
+# The left team (team 0) attacks to the right.
+
+class RewardTerm:
+    """
+    Base class of the reward terms.
+    """
+    name = "term"
+
+    def __call__(self, previous, state):
+        raise NotImplementedError
+
+
+class GoalReward(RewardTerm):
+    """
+    1 for the players of the team that scored in the frame, -1 for the
+    players of the team that conceded.
+    """
+    name = "goal"
+
+    def __call__(self, previous, state):
+        left = (state["left_goal"] - previous["left_goal"])[:, None]
+        right = (state["right_goal"] - previous["right_goal"])[:, None]
+        return np.where(state["team"] == 0, left - right, right - left).astype(float)
+
+
+class BallProgressReward(RewardTerm):
+    """
+    Distance (m) that the ball moved towards the goal attacked by the player's
+    team in the frame. It is zero in the frame of a goal, when the ball is put
+    back in the center.
+    """
+    name = "ball_progress"
+
+    def __call__(self, previous, state):
+        dx = state["ball_position"][:, 0] - previous["ball_position"][:, 0]
+        goal = ((state["left_goal"] != previous["left_goal"]) |
+            (state["right_goal"] != previous["right_goal"]))
+        dx = np.where(goal, 0.0, dx)
+        return dx[:, None] * attack_direction(state)
+
+
+class DistanceToBallReward(RewardTerm):
+    """
+    Minus the distance (m) between the player and the ball, from the border of
+    the player to the border of the ball.
+    """
+    name = "distance_to_ball"
+
+    def __call__(self, previous, state):
+        delta = state["player_position"] - state["ball_position"][:, None, :]
+        distance = np.hypot(delta[..., 0], delta[..., 1])
+        reach = state["player_radius"] + state["ball_radius"][:, None]
+        return -np.maximum(distance - reach, 0.0)
+
+
+class CollisionPenalty(RewardTerm):
+    """
+    -1 for the players whose bumper is detecting a collision with a wall or
+    another player.
+    """
+    name = "collision"
+
+    def __call__(self, previous, state):
+        return -state["player_bumper"].astype(float)
+
+# ______________________________________________________________________________
+# class RewardFunction
+class RewardFunction:
+    """
+    Weighted sum of reward terms, registered once and evaluated on batch states.
+    """
+    def __init__(self, terms=()):
+        """
+        :param terms: pairs (term, weight).
+        :type terms: list of tuple
+        """
+        self.terms = []
+        self.components = {}
+        for term, weight in terms:
+            self.add(term, weight)
+
+    def add(self, term, weight=1.0):
+        """
+        Registers a term.
+
+        :param term: the term.
+        :type term: RewardTerm
+        :param weight: multiplier of the term.
+        :type weight: float
+        :return: the reward function, to chain calls.
+        :rtype: RewardFunction
+        """
+        self.terms.append((term, weight))
+        return self
+
+    def __call__(self, previous, state):
+        """
+        Evaluates the terms. The value of each term (without the weight) is
+        kept in components by the name of the term.
+
+        :return: (simulations, players) rewards.
+        :rtype: numpy.ndarray
+        """
+        reward = np.zeros(state["team"].shape)
+        for term, weight in self.terms:
+            value = term(previous, state)
+            self.components[term.name] = value
+            reward += weight * value
+        return reward
+
+# ______________________________________________________________________________
+# class RewardTracker
+class RewardTracker:
+    """
+    Computes the rewards of some simulations after every frame. The states of
+    the current and the previous frame are written directly in preallocated
+    batch arrays (see Simulation.write_state), so the rewards of all the
+    simulations are computed at once without building the state again.
+    """
+    def __init__(self, simulations, reward):
+        """
+        :param simulations: simulations with the same number of players.
+        :type simulations: list of Simulation
+        :param reward: the reward function.
+        :type reward: RewardFunction
+        """
+        self.simulations = list(simulations)
+        self.reward = reward
+        self.buffers = [self.new_batch(), self.new_batch()]
+        self.current = 0
+        self.state = self.previous = None
+        self.last_reward = None
+        self.reset()
+
+    def new_batch(self):
+        """
+        :return: the batch arrays and, for each simulation, views of its row.
+        :rtype: tuple
+        """
+        first = self.simulations[0].new_state()
+        state = {name: np.zeros((len(self.simulations),) + array.shape, dtype=array.dtype)
+            for name, array in first.items()}
+        rows = [{name: array[j, ...] for name, array in state.items()}
+            for j in range(len(self.simulations))]
+        return state, rows
+
+    def write(self, rows, published=False):
+        """
+        Writes the state of each simulation in its row.
+
+        :param published: if True, the state published by the simulations
+            with enable_state_buffer in this frame is copied, instead of
+            being written again from the players and the ball.
+        :type published: bool
+        """
+        for simulation, row in zip(self.simulations, rows):
+            buffer = simulation.state_buffer
+            if published and buffer is not None and buffer.version() == simulation.tick:
+                for name, array in buffer.front.arrays.items():
+                    np.copyto(row[name], array)
+            else:
+                simulation.write_state(row)
+
+    def reset(self):
+        """
+        Takes the current state of the simulations as the previous state, for
+        example after they were restarted from outside.
+        """
+        self.current = 0
+        self.write(self.buffers[0][1])
+        self.state = self.previous = self.buffers[0][0]
+
+    def update(self):
+        """
+        Reads the new state of the simulations and computes the rewards of the
+        last frame. It is called by Simulation.update for the simulations
+        with enable_rewards.
+
+        :return: (simulations, players) rewards.
+        :rtype: numpy.ndarray
+        """
+        self.current = 1 - self.current
+        state, rows = self.buffers[self.current]
+        self.write(rows, published=True)
+        self.previous, self.state = self.state, state
+        self.last_reward = self.reward(self.previous, self.state)
+        return self.last_reward
+
+    def step(self, commands):
+        """
+        Runs a frame of all the simulations.
+
+        :param commands: (simulations, players, 2) array of linear and angular speeds.
+        :type commands: numpy.ndarray
+        :return: the new batch state and the (simulations, players) rewards.
+            The state arrays are overwritten two frames later.
+        :rtype: tuple
+        """
+        for simulation, simulation_commands in zip(self.simulations, commands.tolist()):
+            simulation.set_commands(simulation_commands)
+            simulation.update()
+        reward = self.update()
+        return self.state, reward
@@ -7,8 +7,20 @@ from math import sin, cos, sqrt, pi
 from robot_soccer_python.constants import *
 from robot_soccer_python.utils import *
 from robot_soccer_python.agents import *
+from robot_soccer_python.events import *
+from robot_soccer_python.contact import ContactSolver
+from robot_soccer_python.intercept import BallPath
+from robot_soccer_python.stats import MatchStatistics
+from robot_soccer_python.buffers import DoubleBufferedState
+from robot_soccer_python.rewards import RewardTracker
 from copy import deepcopy
-import datetime
+from collections import namedtuple
+
+# ______________________________________________________________________________
+# data for drawing a frame, see Simulation.snapshot
+
+Snapshot = namedtuple("Snapshot", ["tick", "list_centers", "list_radius",
+    "list_rotation", "left_goal", "right_goal"])
 
 # ______________________________________________________________________________
 # class Simulation
@@ -34,8 +46,24 @@ class Simulation:
         self.full_vision = full_vision
         self.left_goal = 0
         self.right_goal = 0
-        self.goal = datetime.datetime.utcnow()
+        self.tick = 0
+        # no goal yet: the game doesn't restart and a goal can be scored at once
+        self.goal = self.tick - int(GOAL_INTERVAL * FREQUENCY) - 1
         self.initial_position = self.get_initial_position()
+        self.events = EventBuffer()
+        self.restarting = False
+        self.contact_solver = ContactSolver()
+        self.positions = np.zeros((len(player), 2))
+        self.radius = np.array([p.radius for p in player], dtype=float)
+        # other player in contact with each player, found by the contact solver
+        self.contact_partner = [None] * len(player)
+        self.contact_results = [(True, i, (0,0)) for i in range(len(player))]
+        self.partner_index = np.zeros(len(player), dtype=np.intp)
+        self.ball_path = None
+        self.statistics = None
+        self.state_buffer = None
+        self.rewards = None
+        self.reward = None
         
     def get_initial_position(self):
         """
@@ -63,85 +91,67 @@ class Simulation:
         :return: the bumper state (if a collision has been detected).
         :rtype: bool
         """
-        params = self.get_collision_params(num)
+        player = self.player[num]
         # Testing if the bounding box has hit a wall
-        if params["left"] <= 0.0:
-            self.player[num].pose.position.x = self.player[num].radius
+        if player.pose.position.x - player.radius <= 0.0:
+            player.pose.position.x = player.radius
             return True, "left", (0,0)
-        if params["right"] >= params["width"]:
-            self.player[num].pose.position.x = params["width"] - self.player[num].radius
+        if player.pose.position.x + player.radius >= FIELD_WIDTH:
+            player.pose.position.x = FIELD_WIDTH - player.radius
             return True, "right", (0,0)
-        if params["top"] <= 0.0:
-            self.player[num].pose.position.y = self.player[num].radius
+        if player.pose.position.y - player.radius <= 0.0:
+            player.pose.position.y = player.radius
             return True, "top", (0,0)
-        if params["bottom"] >= params["height"]:
-            self.player[num].pose.position.y = params["height"] - self.player[num].radius
+        if player.pose.position.y + player.radius >= FIELD_HEIGHT:
+            player.pose.position.y = FIELD_HEIGHT - player.radius
             return True, "bottom", (0,0)
 
         return self.check_collision_with_players(num)
 
         
 
-    def get_collision_params(self, num = 0, isBall = False):
+    def check_collision_with_players(self, num):
         """
-        Get params for check collision.
+        Check collision with other player, using the contacts found by the
+        contact solver in the last frame (see resolve_contacts).
 
         :param num: the index of player in player's array.
         :type num: int
         :return: the bumper state (if a collision has been detected).
         :rtype: bool
         """
-        if not isBall:
-            params = {
-                # Converting screen limits from pixels to meters
-                "width" : SCREEN_WIDTH * PIX2M,
-                "height" : SCREEN_HEIGHT * PIX2M,
-                # Computing the limits of the player's bounding box
-                "left" : self.player[num].pose.position.x - self.player[num].radius,
-                "right" : self.player[num].pose.position.x + self.player[num].radius,
-                "top" : self.player[num].pose.position.y - self.player[num].radius,
-                "bottom" : self.player[num].pose.position.y + self.player[num].radius
-            }
-        else:
-            params = {
-                # Converting screen limits from pixels to meters
-                "width" : SCREEN_WIDTH * PIX2M,
-                "height" : SCREEN_HEIGHT * PIX2M,
-                # Computing the limits of the player's bounding box
-                "left" : self.ball.pose.position.x - self.ball.radius,
-                "right" : self.ball.pose.position.x + self.ball.radius,
-                "top" : self.ball.pose.position.y - self.ball.radius,
-                "bottom" : self.ball.pose.position.y + self.ball.radius
-            }
-
-        return params
-
+        partner = self.contact_partner[num]
+        if partner is None:
+            return False, None, (0,0)
+        return self.contact_results[partner]
 
-    def check_collision_with_players(self, num):
+    def resolve_contacts(self):
         """
-        Check collision with other player.
-
-        :param num: the index of player in player's array.
-        :type num: int
-        :return: the bumper state (if a collision has been detected).
-        :rtype: bool
+        Separates all the players that overlap, using the contact solver,
+        wakes up the players in contact and keeps who each player is in
+        contact with.
         """
-        bumper_state, n_player, speed = False, None, (0,0)
-        if not self.shockable:
-            return bumper_state, n_player, speed
+        positions = self.positions
+        for i in range(len(self.player)):
+            positions[i, 0] = self.player[i].pose.position.x
+            positions[i, 1] = self.player[i].pose.position.y
+        contact = self.contact_solver.solve(positions, self.radius)
+        # first player in contact with each player, if the row has any
+        contact.argmax(1, self.partner_index)
+        for i in range(len(self.player)):
+            player = self.player[i]
+            partner = self.partner_index.item(i)
+            if contact.item(i, partner):
+                self.contact_partner[i] = partner
+                player.sleeping = False
+            else:
+                self.contact_partner[i] = None
+            player.pose.position.x = positions.item(i, 0)
+            player.pose.position.y = positions.item(i, 1)
 
-        cont = 0
-        for player in self.player:
-            if cont != num:
-                dist_players = self.player[num].pose.dist_square(player.pose)
-                if dist_players <=(self.player[num].radius + player.radius):
-                    bumper_state, n_player = True, cont
-                    player.set_velocity(BACK_SPEED_COLISION,0)
-                cont += 1
-            
-        return bumper_state, n_player, speed
-
-    
+    def clear_contacts(self):
+        for i in range(len(self.contact_partner)):
+            self.contact_partner[i] = None
 
     # __________________________________________________________________________
     # methods for check collision Ball
@@ -156,19 +166,19 @@ class Simulation:
         :return: where the ball collide
         :rtype: string or int or None
         """
-        params = self.get_collision_params(isBall=True)
+        ball = self.ball
         # Testing if the bounding box has hit a wall
-        if params["left"] <= 0.0: 
-            self.ball.pose.position.x = self.ball.radius
+        if ball.pose.position.x - ball.radius <= 0.0: 
+            ball.pose.position.x = ball.radius
             return True, "left", (0,0)
-        if params["right"] >= params["width"]:
-            self.ball.pose.position.x = params["width"] - self.ball.radius
+        if ball.pose.position.x + ball.radius >= FIELD_WIDTH:
+            ball.pose.position.x = FIELD_WIDTH - ball.radius
             return True, "right", (0,0)
-        if params["top"] <= 0.0:
-            self.ball.pose.position.y = self.ball.radius
+        if ball.pose.position.y - ball.radius <= 0.0:
+            ball.pose.position.y = ball.radius
             return True, "top", (0,0)
-        if params["bottom"] >= params["height"]:
-            self.ball.pose.position.y = params["height"] - self.ball.radius
+        if ball.pose.position.y + ball.radius >= FIELD_HEIGHT:
+            ball.pose.position.y = FIELD_HEIGHT - ball.radius
             return True, "bottom", (0,0)
 
         # check collision with other player
@@ -186,18 +196,25 @@ class Simulation:
         :rtype: int
         """
 
-        velocityBall = TransformCartesian(self.ball.linear_speed, self.ball.pose.rotation)
-        velocityBall = Vector2(velocityBall.x, velocityBall.y)
+        ball = self.ball
+        ball_x = ball.linear_speed * cos(ball.pose.rotation)
+        ball_y = ball.linear_speed * sin(ball.pose.rotation)
 
         bumper_state, n_player, speed = False, None, (0,0)
         cont = 0
         for players in self.player:
-            dist_player = self.ball.pose.dist_square(players.pose)
-            dirvector = self.ball.pose.position.dirvector(players.pose.position)
-            dirvector.normalize()
-            u = velocityBall.dot(dirvector)
+            # velocity of the ball relative to the player
+            velocity_x = ball_x - players.linear_speed * cos(players.pose.rotation)
+            velocity_y = ball_y - players.linear_speed * sin(players.pose.rotation)
+            dir_x = ball.pose.position.x - players.pose.position.x
+            dir_y = ball.pose.position.y - players.pose.position.y
+            dist_player = sqrt(dir_x**2 + dir_y**2)
+            if dist_player == 0:
+                u = velocity_x
+            else:
+                u = (velocity_x * dir_x + velocity_y * dir_y) / dist_player
             if u < 0 and dist_player <= (RADIUS_BALL + players.radius):
-                bumper_state, n_player, speed = True, cont, self.calculate_speed(players, self.ball)
+                bumper_state, n_player, speed = True, cont, self.calculate_speed(players, ball)
             cont += 1
         
         return bumper_state, n_player, speed
@@ -214,25 +231,31 @@ class Simulation:
         if agent.linear_speed < 1.0e-2:
             agent.linear_speed = collide_player.linear_speed
         
-        velocity_ball = TransformCartesian(agent.linear_speed, agent.pose.rotation)
-        velocity_ball = Vector2(velocity_ball.x, velocity_ball.y)
-        velocity_player = TransformCartesian(collide_player.linear_speed, collide_player.pose.rotation)
-        velocity_player = Vector2(velocity_player.x, velocity_player.y)
-        dirvector = agent.pose.position.dirvector(collide_player.pose.position)
-        dirvector.normalize()
-        u1 = velocity_ball.dot(dirvector)
-        u1normal = Vector2(velocity_ball.x - u1 * dirvector.x,velocity_ball.y - u1 * dirvector.y)
-        u2 = velocity_player.dot(dirvector)
+        ball_x = agent.linear_speed * cos(agent.pose.rotation)
+        ball_y = agent.linear_speed * sin(agent.pose.rotation)
+        player_x = collide_player.linear_speed * cos(collide_player.pose.rotation)
+        player_y = collide_player.linear_speed * sin(collide_player.pose.rotation)
+        dir_x = agent.pose.position.x - collide_player.pose.position.x
+        dir_y = agent.pose.position.y - collide_player.pose.position.y
+        m = sqrt(dir_x**2 + dir_y**2)
+        if m == 0:
+            dir_x, m = 1.0, 1.0
+        dir_x /= m
+        dir_y /= m
+        u1 = ball_x * dir_x + ball_y * dir_y
+        u2 = player_x * dir_x + player_y * dir_y
         v1 = ((BALL_MASS - PLAYER_MASS) * u1 + 2 * BALL_MASS * u2) / ( BALL_MASS + PLAYER_MASS)
-        vfinal = Vector2(u1normal.x + v1 * dirvector.x,u1normal.y + v1 * dirvector.y)
-        vfinal = TransformPolar(2*vfinal.x, 2*vfinal.y)
+        final_x = 2 * (ball_x + (v1 - u1) * dir_x)
+        final_y = 2 * (ball_y + (v1 - u1) * dir_y)
+        linear_speed = sqrt(final_x**2 + final_y**2)
+        rotation = polar_rotation(final_x, final_y)
         if u1 < 0:
-            if vfinal.rotation > 1.0e-2:
-                vfinal.rotation *= -1
+            if rotation > 1.0e-2:
+                rotation *= -1
             else:
-                vfinal.rotation = pi
+                rotation = pi
         
-        return vfinal.linear_speed, vfinal.rotation
+        return linear_speed, rotation
 
     # __________________________________________________________________________
     # methods for restart game if ball is in the goal
@@ -242,34 +265,98 @@ class Simulation:
         Check if there was a goal and restart the game if there was.
         """
 
-        ball_position = Vector2(self.ball.pose.position.x * M2PIX, self.ball.pose.position.y * M2PIX)
+        ball_x = self.ball.pose.position.x * M2PIX
+        ball_y = self.ball.pose.position.y * M2PIX
+
+        # the limits are the ones of the rounded pixels, compared as floats to
+        # not create int objects every frame (round(x) >= 970 is x >= 969.5)
+        in_goal = (ball_y - RADIUS_BALL > SCREEN_HEIGHT / 2 - 100.5 and
+            ball_y + RADIUS_BALL < SCREEN_HEIGHT / 2 + 100.5)
 
         # left goal
-        if round(ball_position.x - RADIUS_BALL) >= (round(SCREEN_WIDTH)-30) and round(ball_position.y - RADIUS_BALL) >= (round(SCREEN_HEIGHT)/2-100) and round(ball_position.y +  RADIUS_BALL) <= (round(SCREEN_HEIGHT)/2+100):
-            if (datetime.datetime.now() - self.goal).seconds > 3:
+        if ball_x - RADIUS_BALL >= SCREEN_WIDTH - 30.5 and in_goal:
+            if self.tick - self.goal > GOAL_INTERVAL * FREQUENCY:
                 self.left_goal += 1
-                self.goal = datetime.datetime.now()
+                self.goal = self.tick
+                self.events.emit(GoalEvent(self.tick, "left"))
                 
         
         # Right goal
-        if round(ball_position.x + RADIUS_BALL) <= 30 and round(ball_position.y - RADIUS_BALL) >= (round(SCREEN_HEIGHT)/2-100) and round(ball_position.y +  RADIUS_BALL) <= (round(SCREEN_HEIGHT)/2+100):
-            if (datetime.datetime.now() - self.goal).seconds > 3:
+        if ball_x + RADIUS_BALL <= 30.5 and in_goal:
+            if self.tick - self.goal > GOAL_INTERVAL * FREQUENCY:
                 self.right_goal += 1
-                self.goal = datetime.datetime.now()
+                self.goal = self.tick
+                self.events.emit(GoalEvent(self.tick, "right"))
         
-        if (datetime.datetime.now() - self.goal).seconds < 1.0e-3:
+        if self.tick - self.goal < RESTART_TIME * FREQUENCY:
+            if not self.restarting:
+                self.events.emit(RestartEvent(self.tick))
+                self.restarting = True
             self.restart_game()
+        else:
+            self.restarting = False
 
 
     def restart_game(self):
         """
         Restart the game and put the players and ball in its initial positions.
         """
-        self.ball.pose = self.initial_position[0]
+        self.ball.pose.copy_from(self.initial_position[0])
         self.ball.linear_speed = 0.0
         for i in range(1, len(self.initial_position)):
-            self.player[i-1].pose = self.initial_position[i]
+            self.player[i-1].pose.copy_from(self.initial_position[i])
             self.player[i-1].linear_speed = 0.0
+            self.player[i-1].sleeping = False
+        self.clear_contacts()
+
+    def set_start_state(self, player_pose, player_speed, ball_pose, ball_speed, ball_cont_friction):
+        """
+        Puts the players and ball in a new situation, in place, and the match
+        goes on from there without the restart of a goal. After a goal the
+        players still go back to the initial positions.
+
+        :param player_pose: x, y (m) and rotation of each player.
+        :type player_pose: list
+        :param player_speed: linear and angular speed of each player.
+        :type player_speed: list
+        :param ball_pose: x, y (m) and rotation of the ball.
+        :type ball_pose: list
+        :param ball_speed: linear speed of the ball.
+        :type ball_speed: float
+        :param ball_cont_friction: friction counter of the ball.
+        :type ball_cont_friction: int
+        """
+        if len(player_pose) != len(self.player) or len(player_speed) != len(self.player):
+            raise ValueError("the start state has %d players and the simulation has %d"
+                % (len(player_pose), len(self.player)))
+        for player, (x, y, rotation), (linear_speed, angular_speed) in zip(
+                self.player, player_pose, player_speed):
+            player.pose.position.x = x
+            player.pose.position.y = y
+            player.pose.rotation = rotation
+            player.linear_speed = linear_speed
+            player.angular_speed = angular_speed
+            player.bumper_state, player.collision = False, None
+            player.sleeping = False
+
+        ball = self.ball
+        ball.pose.position.x, ball.pose.position.y, ball.pose.rotation = ball_pose
+        ball.linear_speed = ball_speed
+        ball.cont_friction = ball_cont_friction
+        ball.bumper_state, ball.collision = False, None
+        ball.sleeping = False
+        ball.behavior.move_forward.initial = False
+        ball.behavior.change_state(ball.behavior.move_forward)
+
+        # the last goal is old enough to not restart the game nor block a new goal
+        self.goal = self.tick - int(GOAL_INTERVAL * FREQUENCY) - 1
+        self.restarting = False
+        self.ball_path = None
+        self.clear_contacts()
+        if self.statistics is not None:
+            self.statistics.reset_positions()
+        if self.rewards is not None:
+            self.rewards.reset()
     
     # __________________________________________________________________________
     # method for control agents
@@ -286,13 +373,26 @@ class Simulation:
             player.set_velocity(*commands[cont])
             cont += 1
 
-    def get_sensors(self):
+    def get_sensors(self, channels=None, nearest=None):
         """
         Get vector distance for flags, player and ball.
 
+        Without channels, the vectors of each player are the 40 flags followed 
+        by the other players. With channels, only the channels asked are 
+        calculated and the vectors of each player are in a dict by channel.
+
+        param channels: names of the channels, from SENSOR_CHANNELS: "flags", 
+            "teammates", "opponents" and "ball".
+        type channels: list of str
+        param nearest: if given, only this number of the nearest teammates and
+            opponents are in their channels, from the nearest.
+        type nearest: int
         return: list of sensors vector distances of each player.
         rtype: list
         """
+        if channels is not None:
+            return self.get_sensors_channels(channels, nearest)
+
         players_sensors = []
         for i in range(len(self.player)):
             list_center = []
@@ -308,6 +408,199 @@ class Simulation:
         return players_sensors
 
 
+    def get_sensors_channels(self, channels, nearest=None):
+        """
+        Get vector distance of the channels asked, see get_sensors.
+
+        return: dict of vectors by channel of each player.
+        rtype: list of dict
+        """
+        for channel in channels:
+            if channel not in SENSOR_CHANNELS:
+                raise ValueError("unknown sensor channel: %r" % (channel,))
+        players = self.player
+        centers = [(p.pose.position.x * M2PIX, p.pose.position.y * M2PIX) for p in players]
+        teams = self.get_teams().tolist()
+        players_sensors = []
+        for i in range(len(players)):
+            sensors = players[i].sensors
+            vectors = {}
+            if "flags" in channels:
+                vectors["flags"] = sensors.calculate_vectors(players[i], sensors.flag_points)
+            for channel, same_team in (("teammates", True), ("opponents", False)):
+                if channel not in channels:
+                    continue
+                points = [centers[j] for j in range(len(players))
+                    if j != i and (teams[j] == teams[i]) == same_team]
+                if nearest is not None:
+                    x, y = centers[i]
+                    points = sorted(points, key=lambda p: (p[0] - x)**2 + (p[1] - y)**2)[:nearest]
+                vectors[channel] = sensors.calculate_vectors(players[i], points)
+            if "ball" in channels:
+                vectors["ball"] = sensors.calculate_vectors(players[i], [(
+                    self.ball.pose.position.x * M2PIX, self.ball.pose.position.y * M2PIX)])
+            players_sensors.append(vectors)
+
+        return players_sensors
+
+    def get_teams(self):
+        """
+        Get the team of each player. The first half of the players (rounded up)
+        is the left team, like the colors of the Environment.
+
+        return: 0 for the left team and 1 for the right team.
+        rtype: numpy.ndarray
+        """
+        n = len(self.player)
+        return (np.arange(n) >= (n + 1) // 2).astype(int)
+
+    def get_state(self):
+        """
+        Get the state of players and ball as numpy arrays, in meters.
+
+        return: arrays by name: player_position (n, 2), player_rotation, 
+            player_linear_speed, player_angular_speed, player_radius, 
+            player_max_linear_speed, player_max_angular_speed, player_bumper
+            (if the player is colliding), team (n,), ball_position (2,),
+            ball_rotation, ball_linear_speed, ball_radius, ball_cont_friction,
+            left_goal, right_goal and tick.
+        rtype: dict
+        """
+        state = self.new_state()
+        self.write_state(state)
+        return state
+
+    def new_state(self):
+        """
+        Creates the arrays of a state for this simulation, see get_state.
+
+        return: arrays by name, filled with zeros.
+        rtype: dict
+        """
+        n = len(self.player)
+        state = {name: np.zeros(n) for name in ("player_rotation", "player_linear_speed",
+            "player_angular_speed", "player_radius", "player_max_linear_speed",
+            "player_max_angular_speed")}
+        state["player_position"] = np.zeros((n, 2))
+        state["player_bumper"] = np.zeros(n, dtype=bool)
+        state["team"] = np.zeros(n, dtype=int)
+        state["ball_position"] = np.zeros(2)
+        for name in ("ball_rotation", "ball_linear_speed", "ball_radius", "ball_cont_friction"):
+            state[name] = np.zeros(())
+        for name in ("left_goal", "right_goal", "tick"):
+            state[name] = np.zeros((), dtype=int)
+        return state
+
+    def write_state(self, state):
+        """
+        Writes the state of players and ball in arrays created by new_state,
+        without allocating new arrays.
+
+        param state: arrays by name.
+        type state: dict
+        """
+        position = state["player_position"]
+        rotation = state["player_rotation"]
+        linear_speed = state["player_linear_speed"]
+        angular_speed = state["player_angular_speed"]
+        radius = state["player_radius"]
+        max_linear_speed = state["player_max_linear_speed"]
+        max_angular_speed = state["player_max_angular_speed"]
+        bumper = state["player_bumper"]
+        for i in range(len(self.player)):
+            player = self.player[i]
+            position[i, 0] = player.pose.position.x
+            position[i, 1] = player.pose.position.y
+            rotation[i] = player.pose.rotation
+            linear_speed[i] = player.linear_speed
+            angular_speed[i] = player.angular_speed
+            radius[i] = player.radius
+            max_linear_speed[i] = player.max_linear_speed
+            max_angular_speed[i] = player.max_angular_speed
+            bumper[i] = player.bumper_state
+        n = len(self.player)
+        state["team"][(n + 1) // 2:] = 1
+        state["ball_position"][0] = self.ball.pose.position.x
+        state["ball_position"][1] = self.ball.pose.position.y
+        state["ball_rotation"][...] = self.ball.pose.rotation
+        state["ball_linear_speed"][...] = self.ball.linear_speed
+        state["ball_radius"][...] = self.ball.radius
+        state["ball_cont_friction"][...] = self.ball.cont_friction
+        state["left_goal"][...] = self.left_goal
+        state["right_goal"][...] = self.right_goal
+        state["tick"][...] = self.tick
+
+    def get_ball_path(self, horizon=INTERCEPT_HORIZON):
+        """
+        Get the predicted path of the ball. It is computed once per frame.
+
+        :param horizon: predicted time (s).
+        :type horizon: float
+        :return: the path.
+        :rtype: BallPath
+        """
+        if self.ball_path is None or self.ball_path[:2] != (self.tick, horizon):
+            state = get_batch_state([self])
+            path = BallPath(state, horizon, self.ball.max_linear_speed)
+            self.ball_path = (self.tick, horizon, path, state)
+        return self.ball_path[2]
+
+    def get_intercepts(self, horizon=INTERCEPT_HORIZON):
+        """
+        Get where and when each player can reach the ball.
+
+        :param horizon: predicted time (s).
+        :type horizon: float
+        :return: (n,) times (s), (n, 2) points in meters and (n,) mask of the 
+            players that reach the ball before the horizon.
+        :rtype: tuple of numpy.ndarray
+        """
+        path = self.get_ball_path(horizon)
+        times, points, reachable = path.intercept(self.ball_path[3])
+        return times[0], points[0], reachable[0]
+
+    def enable_statistics(self, bins=(100, 65)):
+        """
+        Starts collecting the statistics of the match in every update.
+
+        :param bins: number of cells of the heatmaps along the width and the
+            height of the field.
+        :type bins: tuple
+        :return: the statistics, use its summary method to read them.
+        :rtype: MatchStatistics
+        """
+        if self.statistics is not None:
+            self.statistics.close()
+        self.statistics = MatchStatistics(self, bins)
+        return self.statistics
+
+    def enable_state_buffer(self):
+        """
+        Starts publishing the state at the end of every update, for readers in
+        other threads (see DoubleBufferedState.read).
+
+        :return: the published state.
+        :rtype: DoubleBufferedState
+        """
+        if self.state_buffer is None:
+            self.state_buffer = DoubleBufferedState(self)
+        return self.state_buffer
+
+    def enable_rewards(self, reward):
+        """
+        Starts computing the rewards of the players in every update. The
+        rewards of the last frame are kept in self.reward, an (n,) array.
+        With enable_state_buffer, the rewards use the state published in the
+        update instead of writing it again.
+
+        :param reward: the reward function.
+        :type reward: RewardFunction
+        :return: the tracker that computes the rewards.
+        :rtype: RewardTracker
+        """
+        self.rewards = RewardTracker([self], reward)
+        return self.rewards
+
     # __________________________________________________________________________
     # method for update simulation
     def update(self):
@@ -316,44 +609,113 @@ class Simulation:
         """
 
         
+        awake = False
         for i in range(len(self.player)):
+            # sleeping players don't move, so they can't start a collision
+            if self.player[i].sleeping:
+                continue
+            awake = True
             # update collision
-            self.player[i].set_bumper_state_collision(self.check_collision(i))
+            collision = self.check_collision(i)
+            self.emit_collision_event(collision, i)
+            self.player[i].set_bumper_state_collision(collision)
             # Updating the player's movement
             self.player[i].update()
+            self.player[i].fall_asleep()
+
+        if self.shockable and awake:
+            self.resolve_contacts()
         
-        # update ball's collision
-        self.ball.set_bumper_state_collision(self.check_collision_ball())
-        # Updating the ball's movement
-        self.ball.update()
+        if awake or not self.ball.sleeping:
+            # update ball's collision
+            speed_before = (self.ball.linear_speed, self.ball.pose.rotation)
+            collision = self.check_collision_ball()
+            self.emit_ball_collision_event(collision, speed_before)
+            self.ball.set_bumper_state_collision(collision)
+            # Updating the ball's movement
+            if not self.ball.sleeping:
+                self.ball.update()
+                self.ball.fall_asleep()
         
         self.check_goal()
-        
+        if self.statistics is not None:
+            self.statistics.update()
+        self.tick += 1
+        if self.state_buffer is not None:
+            self.state_buffer.publish(self)
+        if self.rewards is not None:
+            self.reward = self.rewards.update()[0]
+
+    def emit_collision_event(self, collision, num):
+        """
+        Emits the event of a player's collision, only when the collision starts.
 
-    def draw(self, window, environment):
+        :param collision: the result of check_collision.
+        :type collision: tuple
+        :param num: the index of player in player's array.
+        :type num: int
         """
-        Draws the roomba and its movement history.
+        bumper_state, collide, _ = collision
+        if not bumper_state or collide == self.player[num].collision:
+            return
+        if isinstance(collide, str):
+            self.events.emit(WallHitEvent(self.tick, collide, num))
+        else:
+            self.events.emit(PlayerBumpEvent(self.tick, num, collide))
 
-        :param window: pygame's window where the drawing will occur.
-        :param environment: this param is to draw the window
-        :type environment: Environment
+    def emit_ball_collision_event(self, collision, speed_before):
         """
-        list_centers = [np.array([round(M2PIX * self.ball.pose.position.x), round(M2PIX * self.ball.pose.position.y)])]
+        Emits the event of a ball's collision, only when the collision starts,
+        like the collisions of the players. A player that keeps pushing the
+        ball (dribbling) emits a single BallContactEvent, with the impulse of
+        the first frame of the contact.
+
+        :param collision: the result of check_collision_ball.
+        :type collision: tuple
+        :param speed_before: linear speed and rotation of the ball before the collision.
+        :type speed_before: tuple
+        """
+        bumper_state, collide, speed = collision
+        if not bumper_state or collide == self.ball.collision:
+            return
+        if isinstance(collide, str):
+            self.events.emit(WallHitEvent(self.tick, collide))
+            return
+        v0, rotation0 = speed_before
+        v1, rotation1 = speed
+        impulse = BALL_MASS * sqrt((v1 * cos(rotation1) - v0 * cos(rotation0))**2 +
+            (v1 * sin(rotation1) - v0 * sin(rotation0))**2)
+        self.events.emit(BallContactEvent(self.tick, collide, impulse))
+
+    def snapshot(self):
+        """
+        Get the data needed to draw the simulation, in pixels, in an immutable 
+        object that can be given to other threads or processes.
+
+        :return: the snapshot of the simulation.
+        :rtype: Snapshot
+        """
+        list_centers = [(round(M2PIX * self.ball.pose.position.x), round(M2PIX * self.ball.pose.position.y))]
         list_radius = [round(M2PIX * RADIUS_BALL)]
         list_rotation = [self.ball.pose.rotation]
         for i in range(len(self.player)):
-            list_centers.append(np.array([round(M2PIX * self.player[i].pose.position.x), round(M2PIX * self.player[i].pose.position.y)]))
+            list_centers.append((round(M2PIX * self.player[i].pose.position.x), round(M2PIX * self.player[i].pose.position.y)))
             list_radius.append(round(M2PIX * self.player[i].radius))
             list_rotation.append(self.player[i].pose.rotation)
-        params = {
-            "window": window,
-            "list_centers": list_centers,
-            "list_radius": list_radius,
-            "list_rotation": list_rotation,
-            "left_goal": self.left_goal,
-            "right_goal": self.right_goal
 
-        }
+        return Snapshot(self.tick, tuple(list_centers), tuple(list_radius),
+            tuple(list_rotation), self.left_goal, self.right_goal)
+
+    def draw(self, window, environment):
+        """
+        Draws the roomba and its movement history.
+
+        :param window: pygame's window where the drawing will occur.
+        :param environment: this param is to draw the window
+        :type environment: Environment
+        """
+        params = self.snapshot()._asdict()
+        params["window"] = window
 
         environment.draw(params)
 
@@ -371,6 +733,31 @@ class Simulation:
         #         pygame.draw.line(window, color, (self.player[0].pose.position.x * M2PIX, self.player[0].pose.position.y * M2PIX), (int(v.x), int(v.y)), 3)
         #     cont += 1
 
+def get_batch_state(simulations):
+    """
+    Get the state of several simulations with the same number of players, 
+    stacked in arrays with the simulations in the first axis.
+
+    :param simulations: the simulations.
+    :type simulations: list of Simulation
+    :return: arrays by name, like Simulation.get_state.
+    :rtype: dict
+    """
+    states = [simulation.get_state() for simulation in simulations]
+    return {key: np.stack([state[key] for state in states]) for key in states[0]}
+
+def set_batch_commands(simulations, commands):
+    """
+    Sets the commands of several simulations.
+
+    :param simulations: the simulations.
+    :type simulations: list of Simulation
+    :param commands: (simulations, players, 2) array of linear and angular speeds.
+    :type commands: numpy.ndarray
+    """
+    for simulation, simulation_commands in zip(simulations, commands.tolist()):
+        simulation.set_commands(simulation_commands)
+
 def draw(simulation, window, environment):
     """
     Redraws the pygame's window.
@@ -382,5 +769,15 @@ def draw(simulation, window, environment):
     simulation.draw(window, environment)
     pygame.display.update()
 
+def draw_snapshot(snapshot, window, environment):
+    """
+    Redraws the pygame's window from a snapshot of the simulation.
 
-
+    :param snapshot: the snapshot.
+    :type snapshot: Snapshot
+    :param window: pygame's window where the drawing will occur.
+    """
+    params = snapshot._asdict()
+    params["window"] = window
+    environment.draw(params)
+    pygame.display.update()
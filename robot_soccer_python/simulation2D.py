@@ -6,7 +6,6 @@ from robot_soccer_python.utils import Pose
 from robot_soccer_python.agents import Ball
 from robot_soccer_python.simulation import *
 from robot_soccer_python.state_machine_ball import FiniteStateMachineBall, MoveForwardStateBall
-import datetime
 import os
 
 # ______________________________________________________________________________
@@ -33,27 +32,110 @@ def simulation2D(players, shockable = True, full_vision = False):
 
    
 
-def init_simulation(simulation):
-    now = datetime.datetime.now()
-    pygame.init()
-    window = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-    pygame.display.set_caption("Robot soccer 2D environment")
-    # icon = pygame.image.load(os.getcwd() + '/icon.PNG')
-    # pygame.display.set_icon(icon)
-    clock = pygame.time.Clock()
+# ______________________________________________________________________________
+# class Viewer
+class Viewer:
+    """
+    Window where the simulation is drawn. The pygame window, the clock and 
+    the Environment are created once, when the viewer is opened, and are 
+    used until it is closed.
+    """
+    def __init__(self, caption="Robot soccer 2D environment"):
+        """
+        Creates the viewer, closed.
+
+        :param caption: title of the window.
+        :type caption: str
+        """
+        self.caption = caption
+        self.window = None
+        self.clock = None
+        self.environment = None
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def is_open(self):
+        return self.window is not None
+
+    def open(self):
+        """
+        Opens the window, if it isn't open.
+        """
+        if self.is_open():
+            return
+        pygame.init()
+        self.window = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+        pygame.display.set_caption(self.caption)
+        # icon = pygame.image.load(os.getcwd() + '/icon.PNG')
+        # pygame.display.set_icon(icon)
+        self.clock = pygame.time.Clock()
+        self.environment = Environment(self.window)
+
+    def close(self):
+        """
+        Closes the window.
+        """
+        if self.is_open():
+            self.window = None
+            self.clock = None
+            self.environment = None
+            pygame.quit()
 
-    environment = Environment(window)
-    while (datetime.datetime.now() - now).seconds < 1:
-        clock.tick(FREQUENCY)
+    def step(self, simulation, seconds=1.0):
+        """
+        Runs and draws the simulation in real time.
 
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                end_simulation()
+        :param simulation: the simulation.
+        :type simulation: Simulation
+        :param seconds: simulation time.
+        :type seconds: float
+        :return: False if the window was closed by the user.
+        :rtype: bool
+        """
+        self.open()
+        for _ in range(int(round(seconds * FREQUENCY))):
+            self.clock.tick(FREQUENCY)
 
-        simulation.update()
-        draw(simulation, window, environment)
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    self.close()
+                    return False
+
+            simulation.update()
+            self.render(simulation)
+        return True
+
+    def render(self, simulation):
+        """
+        Draws the current state of the simulation.
+
+        :param simulation: the simulation.
+        :type simulation: Simulation
+        """
+        self.open()
+        draw(simulation, self.window, self.environment)
+
+
+viewer = Viewer()
+
+def init_simulation(simulation):
+    """
+    Runs and draws one second of the simulation, in the window that is 
+    shared by all calls.
+
+    :param simulation: the simulation.
+    :type simulation: Simulation
+    :return: False if the window was closed by the user.
+    :rtype: bool
+    """
+    return viewer.step(simulation, 1.0)
 
 
 
 def end_simulation():
-    pygame.quit()
\ No newline at end of file
+    viewer.close()
@@ -0,0 +1,148 @@
+# ______________________________________________________________________________
+# importation
+import numpy as np
+from robot_soccer_python.mapped import create_mapped_file, open_mapped_file
+
+# ______________________________________________________________________________
+# file layout
+#
+# The file (see mapped.py) starts with a header of uint64 fields followed by
+# `count` records, one start state each: the poses (x, y in meters and
+# rotation) and speeds of the players and the ball, and a label with the kind
+# of situation.
+
+MAGIC = 0x524f424f53545254  # "ROBOSTRT"
+COUNT_FIELD, PLAYERS_FIELD = range(1, 3)
+
+# labels of the start states, other integers can be used too
+KICKOFF = 0
+CORNER = 1
+COUNTER_ATTACK = 2
+
+def start_state_dtype(players):
+    return np.dtype([
+        ("player_pose", np.float64, (players, 3)),
+        ("player_speed", np.float64, (players, 2)),
+        ("ball_pose", np.float64, (3,)),
+        ("ball_speed", np.float64),
+        ("ball_cont_friction", np.int64),
+        ("label", np.int32),
+    ])
+
+# ______________________________________________________________________________
+# class StartStateLibrary
+class StartStateLibrary:
+    """
+    Start states in a memory-mapped file, to restart many simulations in
+    varied situations. Restarting copies the records straight to the players
+    and the ball (see Simulation.set_start_state).
+    """
+    def __init__(self, path, count=None, players=None):
+        """
+        Creates the library file, or opens an existing one (read only) if
+        count is None.
+
+        :param path: path of the file.
+        :type path: str
+        :param count: number of start states.
+        :type count: int
+        :param players: number of players of the simulations.
+        :type players: int
+        """
+        self.path = path
+        if count is not None:
+            self.header, self.records = create_mapped_file(path, MAGIC,
+                start_state_dtype(players), count)
+            self.header[[COUNT_FIELD, PLAYERS_FIELD]] = (count, players)
+        else:
+            self.header, self.records = open_mapped_file(path, MAGIC, "start state library",
+                lambda header: (start_state_dtype(int(header[PLAYERS_FIELD])),
+                    int(header[COUNT_FIELD])))
+        self.players = self.records.dtype["player_pose"].shape[0]
+        self.writable = self.records.mode == "r+"
+
+    def __len__(self):
+        return len(self.records)
+
+    def check_players(self, simulation):
+        if len(simulation.player) != self.players:
+            raise ValueError("the simulation has %d players and the library has %d"
+                % (len(simulation.player), self.players))
+
+    def capture(self, index, simulation, label=KICKOFF):
+        """
+        Writes the current state of a simulation as a start state.
+
+        :param index: index of the record.
+        :type index: int
+        :param simulation: the simulation.
+        :type simulation: Simulation
+        :param label: kind of situation (KICKOFF, CORNER, COUNTER_ATTACK...).
+        :type label: int
+        """
+        self.check_players(simulation)
+        record = self.records[index]
+        for i, player in enumerate(simulation.player):
+            record["player_pose"][i] = (player.pose.position.x, player.pose.position.y,
+                player.pose.rotation)
+            record["player_speed"][i] = (player.linear_speed, player.angular_speed)
+        ball = simulation.ball
+        record["ball_pose"] = (ball.pose.position.x, ball.pose.position.y, ball.pose.rotation)
+        record["ball_speed"] = ball.linear_speed
+        record["ball_cont_friction"] = ball.cont_friction
+        record["label"] = label
+
+    def sample(self, count, rng=np.random, label=None):
+        """
+        Takes random start states.
+
+        :param count: number of start states.
+        :type count: int
+        :param rng: random generator.
+        :param label: if given, only start states with this label are taken.
+        :type label: int
+        :return: indexes of the records.
+        :rtype: numpy.ndarray
+        """
+        integers = getattr(rng, "integers", None) or rng.randint
+        if label is None:
+            return integers(0, len(self.records), count)
+        candidates = np.flatnonzero(self.records["label"] == label)
+        if len(candidates) == 0:
+            raise ValueError("there is no start state with label %d" % label)
+        return candidates[integers(0, len(candidates), count)]
+
+    def reset(self, simulations, indexes=None, rng=np.random, label=None):
+        """
+        Puts each simulation in a start state of the library.
+
+        :param simulations: simulations with the number of players of the
+            library, otherwise ValueError is raised.
+        :type simulations: list of Simulation
+        :param indexes: records used for each simulation, random by default.
+        :type indexes: numpy.ndarray
+        :param rng: random generator.
+        :param label: if given, only start states with this label are used.
+        :type label: int
+        :return: indexes of the records used.
+        :rtype: numpy.ndarray
+        """
+        for simulation in simulations:
+            self.check_players(simulation)
+        if indexes is None:
+            indexes = self.sample(len(simulations), rng, label)
+        rows = self.records[indexes]
+        player_pose = rows["player_pose"].tolist()
+        player_speed = rows["player_speed"].tolist()
+        ball_pose = rows["ball_pose"].tolist()
+        ball_speed = rows["ball_speed"].tolist()
+        ball_cont_friction = rows["ball_cont_friction"].tolist()
+        for j, simulation in enumerate(simulations):
+            simulation.set_start_state(player_pose[j], player_speed[j], ball_pose[j],
+                ball_speed[j], ball_cont_friction[j])
+        return indexes
+
+    def flush(self):
+        if self.writable:
+            self.records.flush()
+            self.header.flush()
@@ -9,10 +9,13 @@ from robot_soccer_python.utils import *
 # class FiniteStateMachineBall
 class FiniteStateMachineBall:
     """
-    A finite state machine.
+    A finite state machine. The states of the ball are created once and
+    reused, so changing the state every bounce doesn't create objects.
     """
     def __init__(self, state):
         self.state = state
+        self.move_forward = state if isinstance(state, MoveForwardStateBall) else MoveForwardStateBall(False)
+        self.reflection = state if isinstance(state, Reflection) else Reflection()
 
     def change_state(self, new_state):
         self.state = new_state
@@ -65,7 +68,7 @@ class MoveForwardStateBall(State):
 
     def check_transition(self, agent, state_machine):  
         if agent.get_bumper_state():
-            state_machine.change_state(Reflection())
+            state_machine.change_state(state_machine.reflection)
 
     def execute(self, agent):
         agent.set_cont_friction(self.initial, 1)
@@ -83,23 +86,25 @@ class Reflection(State):
 
     def check_transition(self, agent, state_machine):  
         self.rotation(agent)
-        state_machine.change_state(MoveForwardStateBall(agent.get_bumper_state()))
+        state_machine.move_forward.initial = agent.get_bumper_state()
+        state_machine.change_state(state_machine.move_forward)
 
     def rotation(self, agent):
         if agent.get_bumper_state():
             self.calculate_speed(agent)
 
     def calculate_speed(self, agent):
-        collide = agent.get_collide
-        coordinate = TransformCartesian(agent.linear_speed, agent.pose.rotation)
+        collide = agent.get_collision()
+        x = agent.linear_speed * math.cos(agent.pose.rotation)
+        y = agent.linear_speed * math.sin(agent.pose.rotation)
         if collide in ["left", "right"]:
             if math.fabs(agent.pose.rotation) < 1.0e-3:
                 agent.pose.rotation = math.pi
             else:
-                agent.pose.rotation = TransformPolar(-1 * coordinate.x, coordinate.y).rotation
+                agent.pose.rotation = polar_rotation(-1 * x, y)
         
         elif collide in ["top", "bottom"]:
-            agent.pose.rotation = TransformPolar(coordinate.x, -1*coordinate.y).rotation
+            agent.pose.rotation = polar_rotation(x, -1*y)
 
         elif collide != None:
             agent.linear_speed, agent.pose.rotation = agent.collision_player_speed
@@ -0,0 +1,140 @@
+# ______________________________________________________________________________
+# importation
+import math
+import numpy as np
+from robot_soccer_python.constants import *
+from robot_soccer_python.events import BALL_CONTACT
+
+GOAL_TOP = SCREEN_HEIGHT / 2 - 100  # limits of the goals in pixels
+GOAL_BOTTOM = SCREEN_HEIGHT / 2 + 100
+
+# ______________________________________________________________________________
+# class MatchStatistics
+class MatchStatistics:
+    """
+    Statistics of a match accumulated while it is played, with constant work
+    per agent per frame: possession, distance covered by each player, shots
+    and heatmaps of the positions of each team and of the ball.
+
+    Possession belongs to the team of the last player that touched the ball.
+    A touch is a BallContactEvent (a player starts a contact with the ball),
+    and a shot is a touch after which the ball goes towards the opponent goal.
+    """
+    def __init__(self, simulation, bins=(100, 65)):
+        """
+        Creates the statistics and starts collecting them.
+
+        :param simulation: the simulation.
+        :type simulation: Simulation
+        :param bins: number of cells of the heatmaps along the width and the
+            height of the field.
+        :type bins: tuple
+        """
+        self.simulation = simulation
+        self.bins = bins
+        n = len(simulation.player)
+        self.team = simulation.get_teams().tolist()
+        self.ticks = 0
+        self.possession = np.zeros(2, dtype=np.int64)
+        self.distance = np.zeros(n)
+        self.touches = np.zeros(n, dtype=np.int64)
+        self.shots = np.zeros(2, dtype=np.int64)
+        self.player_heatmap = np.zeros((2, bins[1], bins[0]), dtype=np.int64)
+        self.ball_heatmap = np.zeros((bins[1], bins[0]), dtype=np.int64)
+        self.last_touch = None
+        self.touched = None
+        self.reset_positions()
+        self.scale_x = bins[0] / FIELD_WIDTH
+        self.scale_y = bins[1] / FIELD_HEIGHT
+        simulation.events.subscribe(self.on_event)
+
+    def close(self):
+        """
+        Stops collecting the statistics.
+        """
+        self.simulation.events.unsubscribe(self.on_event)
+
+    def on_event(self, event):
+        if event.kind == BALL_CONTACT:
+            self.touched = event.player
+
+    def reset_positions(self):
+        """
+        Forgets the last positions of the players, when they are moved without
+        running.
+        """
+        self.previous = [(p.pose.position.x, p.pose.position.y) for p in self.simulation.player]
+
+    def cell(self, x, y):
+        column = min(max(int(x * self.scale_x), 0), self.bins[0] - 1)
+        row = min(max(int(y * self.scale_y), 0), self.bins[1] - 1)
+        return row, column
+
+    def update(self):
+        """
+        Adds the last frame of the simulation. It is called by Simulation.update.
+        """
+        simulation = self.simulation
+        self.ticks += 1
+        for i, player in enumerate(simulation.player):
+            x, y = player.pose.position.x, player.pose.position.y
+            if not player.sleeping:
+                # players moved back to the initial position didn't run
+                if not simulation.restarting:
+                    px, py = self.previous[i]
+                    self.distance[i] += math.hypot(x - px, y - py)
+                self.previous[i] = (x, y)
+            row, column = self.cell(x, y)
+            self.player_heatmap[self.team[i], row, column] += 1
+
+        ball = simulation.ball
+        row, column = self.cell(ball.pose.position.x, ball.pose.position.y)
+        self.ball_heatmap[row, column] += 1
+
+        if self.touched is not None:
+            self.last_touch = self.touched
+            self.touches[self.touched] += 1
+            team = self.team[self.touched]
+            if self.is_shot(team):
+                self.shots[team] += 1
+        self.touched = None
+        if self.last_touch is not None:
+            self.possession[self.team[self.last_touch]] += 1
+
+    def is_shot(self, team):
+        """
+        Checks if the ball is going to the goal attacked by the team.
+
+        :param team: 0 for the left team (attacks the right goal), 1 for the right team.
+        :type team: int
+        :rtype: bool
+        """
+        ball = self.simulation.ball
+        dx = ball.linear_speed * math.cos(ball.pose.rotation)
+        dy = ball.linear_speed * math.sin(ball.pose.rotation)
+        goal_x = FIELD_WIDTH if team == 0 else 0.0
+        if dx == 0 or (goal_x - ball.pose.position.x) * dx <= 0:
+            return False
+        y = ball.pose.position.y + dy * (goal_x - ball.pose.position.x) / dx
+        return GOAL_TOP <= y * M2PIX <= GOAL_BOTTOM
+
+    def summary(self):
+        """
+        Gets the statistics until now.
+
+        :return: ticks, possession (fraction of the time with possession of
+            each team), distance (m), touches of each player, shots and goals
+            of each team, and the heatmaps (copies).
+        :rtype: dict
+        """
+        owned = max(int(self.possession.sum()), 1)
+        return {
+            "ticks": self.ticks,
+            "possession": self.possession / owned,
+            "distance": self.distance.copy(),
+            "touches": self.touches.copy(),
+            "shots": self.shots.copy(),
+            "goals": np.array([self.simulation.left_goal, self.simulation.right_goal]),
+            "player_heatmap": self.player_heatmap.copy(),
+            "ball_heatmap": self.ball_heatmap.copy(),
+        }
@@ -6,8 +6,9 @@ simulation = simulation2D([Player(Pose(300 * 0.01, 300 * 0.01, 0), 200, 200, 0.1
 Player(Pose(500 * 0.01, 300 * 0.01, 0), 2, 2, 0.3)], False, False)
 
 
-while True:
+running = True
+while running:
     simulation.set_commands([(2, 2), (5, 1), (0,0)])
-    init_simulation(simulation)
+    running = init_simulation(simulation)
     player_sensors = simulation.get_sensors()
     
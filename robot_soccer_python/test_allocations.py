@@ -0,0 +1,59 @@
+# ______________________________________________________________________________
+# importation
+import tracemalloc
+from robot_soccer_python.simulation2D import simulation2D
+from robot_soccer_python.agents import Player, Pose
+
+UPDATES = 300
+# what update() still allocates doesn't depend on the number of players: the
+# iterators of the for loops, the int objects of the tick counter and numpy's
+# small fixed buffers (about 250 bytes in total)
+TOLERANCE = 1024  # bytes
+
+def update_peaks(players, updates):
+    """
+    Runs a match and measures the peak of the memory allocated during each
+    update, not counting the updates that emitted events (the events are
+    new objects kept in simulation.events).
+
+    :param players: number of players.
+    :type players: int
+    :param updates: number of updates measured.
+    :type updates: int
+    :return: peak of each update, in bytes above the memory allocated before
+        the update.
+    :rtype: list of int
+    """
+    simulation = simulation2D([Player(Pose(1 + i * 0.6 % 8, 1 + (i % 4) * 1.2, 0.3 * i), 2, 2, 0.2)
+        for i in range(players)], True, False)
+    commands = [(0.5, 0.3 * (i % 3 - 1)) for i in range(players)]
+    # warm up: the ball starts moving and the players reach the walls
+    for _ in range(300):
+        simulation.set_commands(commands)
+        simulation.update()
+
+    peaks = []
+    tracemalloc.start()
+    try:
+        for _ in range(updates):
+            simulation.set_commands(commands)
+            simulation.events.clear()
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            simulation.update()
+            if len(simulation.events) == 0:
+                peaks.append(tracemalloc.get_traced_memory()[1] - before)
+    finally:
+        tracemalloc.stop()
+    return peaks
+
+def test_update_allocates_no_memory():
+    for players in (8, 22):
+        peaks = update_peaks(players, UPDATES)
+        assert len(peaks) > UPDATES // 2, "too many updates with events"
+        assert max(peaks) < TOLERANCE, "%d bytes allocated by an update with %d players" % (
+            max(peaks), players)
+
+if __name__ == "__main__":
+    test_update_allocates_no_memory()
+    print("update() allocates no memory")
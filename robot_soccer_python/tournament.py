@@ -0,0 +1,354 @@
+# ______________________________________________________________________________
+# importation
+import hashlib
+import inspect
+import itertools
+import json
+import os
+import pickle
+import random
+import types
+import numpy as np
+from multiprocessing import Pool
+from math import pi
+from robot_soccer_python.constants import *
+from robot_soccer_python.agents import Player
+from robot_soccer_python.utils import Pose
+from robot_soccer_python.simulation2D import simulation2D
+
+# ______________________________________________________________________________
+# match configuration
+
+DEFAULT_CONFIG = {
+    "players_per_team": 2,
+    "duration": 120.0,  # match duration (s)
+    "max_linear_speed": 2.0,
+    "max_angular_speed": 2.0,
+    "radius": 0.2,
+    "shockable": True,
+    "full_vision": False,
+}
+
+def describe(value, seen=None):
+    """
+    Describes a value with a text that doesn't change between runs (without
+    memory addresses): functions by their name, code, default arguments and
+    closure variables, and other objects by their class and attributes.
+
+    :param value: the value.
+    :return: the description.
+    :rtype: str
+    """
+    if value is None or isinstance(value, (bool, int, float, complex, str, bytes)):
+        return repr(value)
+    seen = set() if seen is None else seen
+    if id(value) in seen:
+        return "<cycle>"
+    seen = seen | {id(value)}
+    if isinstance(value, (list, tuple)):
+        return "%s(%s)" % (type(value).__name__, ", ".join(describe(v, seen) for v in value))
+    if isinstance(value, (set, frozenset)):
+        return "%s(%s)" % (type(value).__name__, ", ".join(sorted(describe(v, seen) for v in value)))
+    if isinstance(value, dict):
+        return "dict(%s)" % ", ".join(sorted("%s: %s" % (describe(k, seen), describe(v, seen))
+            for k, v in value.items()))
+    if isinstance(value, np.ndarray):
+        return "ndarray(%s, %s, %s)" % (value.dtype, value.shape,
+            hashlib.sha1(np.ascontiguousarray(value).tobytes()).hexdigest())
+    if isinstance(value, types.CodeType):
+        return "code(%s, %s, %s, %s)" % (value.co_qualname if hasattr(value, "co_qualname")
+            else value.co_name, value.co_code.hex(), describe(value.co_consts, seen),
+            describe(value.co_names, seen))
+    if isinstance(value, types.FunctionType):
+        cells = [cell.cell_contents for cell in value.__closure__ or ()]
+        return "function(%s.%s, %s, %s, %s, %s)" % (value.__module__, value.__qualname__,
+            describe(value.__code__, seen), describe(value.__defaults__, seen),
+            describe(value.__kwdefaults__, seen), describe(cells, seen))
+    if isinstance(value, (types.BuiltinFunctionType, types.ModuleType, type)):
+        return "%s(%s)" % (type(value).__name__, getattr(value, "__qualname__", value.__name__))
+    if isinstance(value, types.MethodType):
+        return "method(%s, %s)" % (describe(value.__func__, seen), describe(value.__self__, seen))
+    attributes = dict(getattr(value, "__dict__", {}))
+    for name in getattr(type(value), "__slots__", ()):
+        if hasattr(value, name):
+            attributes[name] = getattr(value, name)
+    return "%s.%s(%s)" % (type(value).__module__, type(value).__qualname__,
+        describe(attributes, seen))
+
+def controller_hash(controller):
+    """
+    Computes a hash that identifies a controller. The hash changes when the
+    source code or the parameters of the controller change, and it is the
+    same in every run, so the results saved can be found again. Controllers
+    that can't be pickled (lambdas, closures) are identified with describe.
+
+    :param controller: a function or object.
+    :type controller: callable
+    :return: the hexadecimal hash.
+    :rtype: str
+    """
+    sha = hashlib.sha1()
+    code = controller if inspect.isroutine(controller) else type(controller)
+    try:
+        sha.update(inspect.getsource(code).encode("utf-8"))
+    except (OSError, TypeError):
+        pass
+    try:
+        sha.update(pickle.dumps(controller))
+    except (pickle.PicklingError, AttributeError, TypeError):
+        sha.update(describe(controller).encode("utf-8"))
+    return sha.hexdigest()
+
+def match_key(left_hash, right_hash, seed, config):
+    """
+    Computes the key of a match in the results file.
+
+    :return: the hexadecimal key.
+    :rtype: str
+    """
+    data = json.dumps([left_hash, right_hash, seed, config], sort_keys=True)
+    return hashlib.sha1(data.encode("utf-8")).hexdigest()
+
+def kickoff_players(config, rng):
+    """
+    Creates the players of both teams in their initial positions. The left
+    team comes first in the list, like in the Environment colors.
+
+    :param config: the match configuration.
+    :type config: dict
+    :param rng: random generator used to move the players a little.
+    :type rng: random.Random
+    :return: list of players.
+    :rtype: list
+    """
+    n = config["players_per_team"]
+    width, height = SCREEN_WIDTH * PIX2M, SCREEN_HEIGHT * PIX2M
+    players = []
+    for side in (0, 1):
+        for i in range(n):
+            x = width * (0.1 + 0.3 * (i % 2) / max(1, n - 1)) + rng.uniform(-0.1, 0.1)
+            y = height * (i + 1) / (n + 1) + rng.uniform(-0.1, 0.1)
+            rotation = 0.0
+            if side == 1:
+                x, rotation = width - x, pi
+            players.append(Player(Pose(x, y, rotation), config["max_linear_speed"],
+                config["max_angular_speed"], config["radius"]))
+    return players
+
+def play_match(left, right, seed=0, config=None):
+    """
+    Plays a match without drawing it.
+
+    A controller is called every frame as ``controller(simulation, indexes, side)``,
+    where ``indexes`` are the indexes of its team's players in ``simulation.player``
+    and ``side`` is "left" or "right", and it returns a list of commands
+    (linear speed, angular speed) for those players.
+
+    :param left: controller of the left team.
+    :type left: callable
+    :param right: controller of the right team.
+    :type right: callable
+    :param seed: seed of the initial positions.
+    :type seed: int
+    :param config: the match configuration, DEFAULT_CONFIG is used for missing keys.
+    :type config: dict
+    :return: left and right goals.
+    :rtype: tuple
+    """
+    config = dict(DEFAULT_CONFIG, **(config or {}))
+    rng = random.Random(seed)
+    n = config["players_per_team"]
+    simulation = simulation2D(kickoff_players(config, rng),
+        config["shockable"], config["full_vision"])
+    left_indexes, right_indexes = list(range(n)), list(range(n, 2 * n))
+    for _ in range(int(config["duration"] * FREQUENCY)):
+        commands = (list(left(simulation, left_indexes, "left")) +
+            list(right(simulation, right_indexes, "right")))
+        simulation.set_commands(commands)
+        simulation.update()
+    return simulation.left_goal, simulation.right_goal
+
+def _play(job):
+    key, left_name, right_name, left, right, seed, config = job
+    left_goal, right_goal = play_match(left, right, seed, config)
+    return {"key": key, "left": left_name, "right": right_name, "seed": seed,
+        "left_goal": left_goal, "right_goal": right_goal}
+
+# ______________________________________________________________________________
+# ratings
+
+def elo_ratings(results, names, k=32.0, initial=1500.0):
+    """
+    Computes Elo ratings from match results.
+
+    :param results: list of results in the order they were scheduled.
+    :type results: list of dict
+    :param names: names of all controllers.
+    :type names: list of str
+    :param k: Elo K-factor.
+    :type k: float
+    :return: rating of each controller.
+    :rtype: dict
+    """
+    ratings = {name: initial for name in names}
+    for result in results:
+        a, b = result["left"], result["right"]
+        expected = 1.0 / (1.0 + 10 ** ((ratings[b] - ratings[a]) / 400.0))
+        diff = result["left_goal"] - result["right_goal"]
+        score = 1.0 if diff > 0 else 0.0 if diff < 0 else 0.5
+        ratings[a] += k * (score - expected)
+        ratings[b] -= k * (score - expected)
+    return ratings
+
+# ______________________________________________________________________________
+# class Tournament
+
+class Tournament:
+    """
+    Runs matches between a roster of controllers and saves the results in
+    a file, so a run that was interrupted can be resumed and matches that
+    were already played are not played again.
+    """
+    def __init__(self, roster, results_path, config=None, seeds=(0,), processes=None):
+        """
+        Creates a tournament.
+
+        :param roster: controllers by name. They must be picklable to run in
+            more than one process.
+        :type roster: dict
+        :param results_path: path of the results file (JSON lines).
+        :type results_path: str
+        :param config: the match configuration.
+        :type config: dict
+        :param seeds: each pair of controllers plays one match per seed.
+        :type seeds: list of int
+        :param processes: number of worker processes, None for the number of
+            CPUs and 1 to play in this process.
+        :type processes: int
+        """
+        self.roster = dict(roster)
+        self.names = sorted(self.roster)
+        self.hashes = {name: controller_hash(self.roster[name]) for name in self.names}
+        self.results_path = results_path
+        self.config = dict(DEFAULT_CONFIG, **(config or {}))
+        self.seeds = list(seeds)
+        self.processes = processes
+        self.results = self.load_results()
+
+    def load_results(self):
+        """
+        Loads the results saved in the results file.
+
+        :return: results by match key.
+        :rtype: dict
+        """
+        results = {}
+        if os.path.exists(self.results_path):
+            with open(self.results_path) as f:
+                for line in f:
+                    try:
+                        result = json.loads(line)
+                    except ValueError:
+                        # the last line may be incomplete if the run was killed
+                        continue
+                    results[result["key"]] = result
+        return results
+
+    def key(self, left, right, seed):
+        return match_key(self.hashes[left], self.hashes[right], seed, self.config)
+
+    def play(self, pairs):
+        """
+        Plays the matches between pairs of controllers that were not played yet.
+
+        :param pairs: list of (left name, right name).
+        :type pairs: list of tuple
+        :return: the results of the matches, in the order of pairs and seeds.
+        :rtype: list of dict
+        """
+        keys, jobs = [], []
+        for left, right in pairs:
+            for seed in self.seeds:
+                key = self.key(left, right, seed)
+                keys.append(key)
+                if key not in self.results and key not in [job[0] for job in jobs]:
+                    jobs.append((key, left, right, self.roster[left],
+                        self.roster[right], seed, self.config))
+
+        # a rerun with every result saved doesn't start the worker processes
+        if jobs:
+            with open(self.results_path, "a") as f:
+                if self.processes == 1:
+                    played = map(_play, jobs)
+                    self.save(played, f)
+                else:
+                    with Pool(self.processes) as pool:
+                        self.save(pool.imap_unordered(_play, jobs), f)
+
+        return [self.results[key] for key in keys]
+
+    def save(self, played, f):
+        for result in played:
+            self.results[result["key"]] = result
+            f.write(json.dumps(result) + "\n")
+            f.flush()
+
+    def round_robin(self):
+        """
+        Plays a round-robin: every controller plays against every other, once
+        on each side of the field.
+
+        :return: the results of the matches.
+        :rtype: list of dict
+        """
+        return self.play(list(itertools.permutations(self.names, 2)))
+
+    def swiss(self, rounds):
+        """
+        Plays a Swiss tournament: in each round the controllers are paired with
+        others that have a similar score and that they haven't played yet.
+
+        :param rounds: number of rounds.
+        :type rounds: int
+        :return: the results of the matches.
+        :rtype: list of dict
+        """
+        points = {name: 0.0 for name in self.names}
+        played = set()
+        results = []
+        for _ in range(rounds):
+            standing = sorted(self.names, key=lambda name: (-points[name], name))
+            pairs = []
+            while len(standing) > 1:
+                a = standing.pop(0)
+                b = next((name for name in standing
+                    if frozenset((a, name)) not in played), standing[0])
+                standing.remove(b)
+                played.add(frozenset((a, b)))
+                pairs.append((a, b))
+            round_results = self.play(pairs)
+            for result in round_results:
+                diff = result["left_goal"] - result["right_goal"]
+                points[result["left"]] += 1.0 if diff > 0 else 0.0 if diff < 0 else 0.5
+                points[result["right"]] += 1.0 if diff < 0 else 0.0 if diff > 0 else 0.5
+            results += round_results
+        return results
+
+    def ratings(self, results=None, k=32.0):
+        """
+        Computes the Elo ratings of the controllers.
+
+        :param results: the results used, by default all results of this
+            roster and configuration in the results file, sorted like the
+            matches of a round-robin (pair, then seed), because the ratings
+            depend on the order of the results.
+        :type results: list of dict
+        :return: rating of each controller.
+        :rtype: dict
+        """
+        if results is None:
+            results = [result for result in self.results.values()
+                if result["left"] in self.roster and result["right"] in self.roster
+                and result["key"] == self.key(result["left"], result["right"], result["seed"])]
+            results.sort(key=lambda result: (result["left"], result["right"], result["seed"]))
+        return elo_ratings(results, self.names, k)
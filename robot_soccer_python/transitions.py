@@ -0,0 +1,207 @@
+# ______________________________________________________________________________
+# importation
+import numpy as np
+from robot_soccer_python.constants import *
+from robot_soccer_python.mapped import create_mapped_file, open_mapped_file
+
+# ______________________________________________________________________________
+# file layout
+#
+# The file (see mapped.py) starts with a header of uint64 fields followed by
+# `capacity` records. The only writer is the actor: it writes a record and
+# then increases `head`, the number of records written since the file was
+# created. Readers never write, so no lock is needed: the valid records are
+# the last `capacity` ones before `head`, and each record keeps the number it
+# was written with (INVALID while it is being written), so readers can
+# discard records that were overwritten while they were reading.
+
+MAGIC = 0x524f424f54524e47  # "ROBOTRNG"
+INVALID = np.iinfo(np.uint64).max
+CAPACITY_FIELD, OBSERVATION_FIELD, COMMAND_FIELD, HEAD_FIELD = range(1, 5)
+
+def record_dtype(observation_size, command_size):
+    # aligned, so the size of a record is a multiple of 8 and the sequence of
+    # every record is 8-byte aligned in the file (the header is 64 bytes):
+    # the writer stores it with a single write that readers can't see half done
+    return np.dtype([
+        ("sequence", np.uint64),
+        ("observation", np.float32, (observation_size,)),
+        ("command", np.float32, (command_size,)),
+        ("score_delta", np.float32),
+        ("done", np.bool_),
+    ], align=True)
+
+def flatten_sensors(sensors):
+    """
+    Converts the result of Simulation.get_sensors to a flat array. With
+    channels, the vectors of each player are taken by channel in the order of
+    SENSOR_CHANNELS ("flags", "teammates", "opponents", "ball"), skipping the
+    channels that weren't asked.
+
+    :param sensors: list of sensors vectors of each player, or of dicts of
+        vectors by channel.
+    :type sensors: list
+    :return: x and y of every vector, player by player.
+    :rtype: numpy.ndarray
+    """
+    vectors = []
+    for player in sensors:
+        if isinstance(player, dict):
+            for channel in SENSOR_CHANNELS:
+                vectors.extend(player.get(channel, ()))
+        else:
+            vectors.extend(player)
+    return np.array([(v.x, v.y) for v in vectors], dtype=np.float32).ravel()
+
+# ______________________________________________________________________________
+# class TransitionRing
+class TransitionRing:
+    """
+    Fixed size ring of transitions (observation, command, score delta, done)
+    in a memory-mapped file, shared by one writer and any number of readers
+    on the same host.
+    """
+    def __init__(self, path, capacity=None, observation_size=None, command_size=None):
+        """
+        Creates the ring file, or opens an existing one if capacity is None.
+
+        :param path: path of the file.
+        :type path: str
+        :param capacity: number of transitions kept.
+        :type capacity: int
+        :param observation_size: number of values of an observation.
+        :type observation_size: int
+        :param command_size: number of values of a command.
+        :type command_size: int
+        """
+        self.path = path
+        if capacity is not None:
+            self.header, self.records = create_mapped_file(path, MAGIC,
+                record_dtype(observation_size, command_size), capacity)
+            self.header[[CAPACITY_FIELD, OBSERVATION_FIELD, COMMAND_FIELD]] = (
+                capacity, observation_size, command_size)
+        else:
+            self.header, self.records = open_mapped_file(path, MAGIC, "transition ring",
+                lambda header: (record_dtype(int(header[OBSERVATION_FIELD]),
+                    int(header[COMMAND_FIELD])), int(header[CAPACITY_FIELD])))
+        self.capacity = len(self.records)
+        self.writable = self.records.mode == "r+"
+
+    @property
+    def head(self):
+        """
+        Number of transitions written since the ring was created.
+        """
+        return int(self.header[HEAD_FIELD])
+
+    def __len__(self):
+        return min(self.head, self.capacity)
+
+    def append(self, observation, command, score_delta, done):
+        """
+        Writes a transition, overwriting the oldest one if the ring is full.
+
+        :param observation: the observation before the command.
+        :type observation: numpy.ndarray
+        :param command: the command.
+        :type command: numpy.ndarray
+        :param score_delta: the change of the score after the command.
+        :type score_delta: float
+        :param done: if the episode has ended.
+        :type done: bool
+        """
+        head = self.head
+        i = head % self.capacity
+        records = self.records
+        records["sequence"][i] = INVALID
+        records["observation"][i] = observation
+        records["command"][i] = command
+        records["score_delta"][i] = score_delta
+        records["done"][i] = done
+        records["sequence"][i] = head
+        self.header[HEAD_FIELD] = head + 1
+
+    def sample(self, batch_size, rng=np.random, margin=None):
+        """
+        Takes random transitions. The oldest records, that the writer may be
+        overwriting, are not used and records overwritten while they were
+        read are discarded, so the batch may be smaller than batch_size.
+
+        :param batch_size: number of transitions.
+        :type batch_size: int
+        :param rng: random generator.
+        :param margin: number of oldest records not used, by default 1% of the capacity.
+        :type margin: int
+        :return: arrays of the transitions by field name.
+        :rtype: dict
+        """
+        if margin is None:
+            margin = max(1, self.capacity // 100)
+        head = self.head
+        tail = max(0, head - self.capacity + margin)
+        if head <= tail:
+            return {name: self.records[:0][name] for name in self.records.dtype.names}
+        integers = getattr(rng, "integers", None) or rng.randint
+        sequence = integers(tail, head, batch_size).astype(np.uint64)
+        index = sequence % self.capacity
+        batch = self.records[index]
+        # the record is valid if it had the same number before and after the copy
+        valid = (batch["sequence"] == sequence) & (self.records["sequence"][index] == sequence)
+        batch = batch[valid]
+        return {name: batch[name] for name in batch.dtype.names}
+
+    def latest(self, count):
+        """
+        Gets the most recent transitions that are contiguous in the file,
+        without copying them. They can be overwritten by the writer, check the
+        "sequence" field if it matters.
+
+        :param count: maximum number of transitions.
+        :type count: int
+        :return: view of the records.
+        :rtype: numpy.ndarray
+        """
+        head = self.head
+        end = head % self.capacity or (self.capacity if head else 0)
+        return self.records[max(0, end - min(count, len(self))):end]
+
+    def flush(self):
+        if self.writable:
+            self.records.flush()
+            self.header.flush()
+
+# ______________________________________________________________________________
+# class TransitionRecorder
+class TransitionRecorder:
+    """
+    Writes the transitions of a simulation in a TransitionRing.
+    """
+    def __init__(self, simulation, ring):
+        """
+        :param simulation: the simulation.
+        :type simulation: Simulation
+        :param ring: the ring where the transitions are written.
+        :type ring: TransitionRing
+        """
+        self.simulation = simulation
+        self.ring = ring
+        self.score = simulation.left_goal - simulation.right_goal
+
+    def record(self, observation, commands, done=False):
+        """
+        Writes a transition after simulation.update(). The score delta is the
+        change of left goals minus right goals since the last record.
+
+        :param observation: the observation used to choose the commands, an
+            array or the result of Simulation.get_sensors, with or without
+            channels (see flatten_sensors).
+        :param commands: the commands passed to Simulation.set_commands.
+        :type commands: list of tuple
+        :param done: if the episode has ended.
+        :type done: bool
+        """
+        if isinstance(observation, list):
+            observation = flatten_sensors(observation)
+        score = self.simulation.left_goal - self.simulation.right_goal
+        self.ring.append(observation, np.ravel(commands), score - self.score, done)
+        self.score = score
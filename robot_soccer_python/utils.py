@@ -19,12 +19,36 @@ def clamp(value, min, max):
         return min
     return value
 
+def polar_rotation(x, y):
+    """
+    Computes the rotation of the vector (x, y) in polar coordinates, with the
+    same convention of TransformPolar but without creating an object.
+
+    :param x: x coordinate.
+    :type x: float
+    :param y: y coordinate.
+    :type y: float
+    :return: the rotation.
+    :rtype: float
+    """
+    if x > 1.0e-03:
+        rotation = math.atan(y/x)
+    elif y > 0:
+        rotation = math.pi
+    else:
+        rotation = -1*math.pi
+    if x < 0:
+        rotation += math.pi
+    return rotation
+
 # ______________________________________________________________________________
 # class for vactor 2D
 class Vector2(object):
     """
     Represents a bidimensional geometric vector.
     """
+    __slots__ = ("x", "y")
+
     def __init__(self, x, y):
         """
         Creates a bidimensional geometric vector.
@@ -64,6 +88,8 @@ class Pose(object):
     """
     Represents a pose on the plane, i.e. a (x, y) position plus a rotation.
     """
+    __slots__ = ("position", "rotation")
+
     def __init__(self, x, y, rotation):
         """
         Creates a pose on the plane.
@@ -78,27 +104,33 @@ class Pose(object):
         self.position = Vector2(x, y)
         self.rotation = rotation
 
+    def copy_from(self, pose):
+        """
+        Copies the position and rotation of other pose to this pose.
+
+        :param pose: the pose to be copied.
+        :type pose: Pose
+        """
+        self.position.x = pose.position.x
+        self.position.y = pose.position.y
+        self.rotation = pose.rotation
+
     def dist_square(self, pose):
         return math.sqrt((self.position.x - pose.position.x)**2 + (self.position.y - pose.position.y)**2)
 
 class TransformCartesian(object):
+    __slots__ = ("x", "y")
 
     def __init__(self, linear_speed, rotation):
         self.x = linear_speed * math.cos(rotation)
         self.y = linear_speed * math.sin(rotation)
 
 class TransformPolar(object):
-    
+    __slots__ = ("linear_speed", "rotation")
+
     def __init__(self, x, y):
         self.linear_speed = math.sqrt(x**2 + y**2)
-        if x > 1.0e-03:
-            self.rotation = math.atan(y/x)
-        elif y > 0:
-            self.rotation = math.pi
-        else:
-            self.rotation = -1*math.pi
-        if x < 0:
-            self.rotation += math.pi
+        self.rotation = polar_rotation(x, y)
         
 
 